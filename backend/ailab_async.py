@@ -0,0 +1,95 @@
+# backend/ailab_async.py
+
+import asyncio
+import os
+
+try:
+    import httpx
+except ImportError:  # httpx가 없으면 비동기 업스트림 모드를 사용할 수 없음 (동기 모드는 그대로 동작)
+    httpx = None
+
+from ailab_client import (AILAB_POOL_MAXSIZE, AILAB_CONNECT_RETRIES, AILAB_HEDGE_REQUESTS, AILAB_HEDGE_PERCENTILE,
+                          observe_rate_limit)
+from circuit_breaker import get_breaker
+from upstream_governor import get_governor
+
+HTTPX_AVAILABLE = httpx is not None
+
+# 비동기 모드에서 동시에 열어 둘 수 있는 최대 커넥션 수
+# (폴링 대기 중인 작업은 커넥션을 쓰지 않으므로 진행 중인 작업 수보다 훨씬 작아도 됨)
+AILAB_ASYNC_MAX_CONNECTIONS = int(os.getenv('AILAB_ASYNC_MAX_CONNECTIONS', '100'))
+
+
+class AsyncAILabClient:
+    """모든 비동기 AILab 호출이 공유하는 httpx.AsyncClient 래퍼
+
+    ailab_client의 공유 requests.Session과 같은 역할입니다.
+    - keep-alive 커넥션 수는 AILAB_POOL_MAXSIZE, 연결 단계 오류 재시도는 AILAB_CONNECT_RETRIES를 그대로 사용
+    - 클라이언트는 처음 호출한 이벤트 루프에서 만들어지므로 AsyncRuntime의 루프 안에서만 사용해야 합니다.
+    요청 인자(headers, data, files, params, timeout, breaker)는 ailab_post/ailab_get과 같고,
+    같은 호출 속도 제한과 엔드포인트별 회로 차단기를 사용합니다.
+    """
+
+    def __init__(self, max_connections=AILAB_ASYNC_MAX_CONNECTIONS, max_keepalive=AILAB_POOL_MAXSIZE,
+                 retries=AILAB_CONNECT_RETRIES):
+        self._max_connections = max_connections
+        self._max_keepalive = max_keepalive
+        self._retries = retries
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            limits = httpx.Limits(max_connections=self._max_connections,
+                                  max_keepalive_connections=self._max_keepalive)
+            # 전송 계층 재시도는 연결 실패(ConnectError/ConnectTimeout)에만 적용되므로 POST 요청에도 안전
+            transport = httpx.AsyncHTTPTransport(retries=self._retries, limits=limits)
+            self._client = httpx.AsyncClient(transport=transport, limits=limits)
+        return self._client
+
+    async def post(self, url, breaker=None, **kwargs):
+        """공유 클라이언트로 POST 요청"""
+        return await self._send(self._get_client().post, url, breaker, kwargs)
+
+    async def get(self, url, breaker=None, **kwargs):
+        """공유 클라이언트로 GET 요청"""
+        return await self._send(self._get_client().get, url, breaker, kwargs)
+
+    async def get_hedged(self, url, breaker, **kwargs):
+        """ailab_get_hedged의 asyncio 버전 (늦게 끝난 쪽 요청은 취소)"""
+        circuit = get_breaker(breaker)
+        delay = circuit.hedge_delay(AILAB_HEDGE_PERCENTILE) if AILAB_HEDGE_REQUESTS else None
+        if delay is None:
+            return await self.get(url, breaker=breaker, **kwargs)
+
+        primary = asyncio.ensure_future(self.get(url, breaker=breaker, **kwargs))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+        hedge = asyncio.ensure_future(self.get(url, breaker=breaker, **kwargs))
+        pending = {primary, hedge}
+        try:
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # 먼저 끝난 쪽이 실패했고 다른 요청이 아직 진행 중이면 그 결과를 기다림
+                winner = next((future for future in done if future.exception() is None), None)
+                if winner is not None or not pending:
+                    winner = winner or done.pop()
+                    circuit.record_hedge(winner is hedge)
+                    return winner.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _send(self, method, url, breaker, kwargs):
+        circuit = get_breaker(breaker) if breaker else None
+        if circuit is not None:
+            circuit.check() # 회로가 열려 있으면 호출 토큰을 쓰기 전에 바로 실패
+        await get_governor().throttle_async()
+        if circuit is None:
+            return observe_rate_limit(await method(url, **kwargs))
+        return observe_rate_limit(await circuit.call_async(method, url, **kwargs))
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
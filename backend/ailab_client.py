@@ -0,0 +1,139 @@
+# backend/ailab_client.py
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from circuit_breaker import get_breaker
+from upstream_governor import get_governor
+
+# --- 커넥션 풀 설정 (환경 변수로 조절 가능) ---
+# 호스트별 풀 개수 / 풀 하나당 유지할 keep-alive 커넥션 수
+AILAB_POOL_CONNECTIONS = int(os.getenv('AILAB_POOL_CONNECTIONS', '4'))
+AILAB_POOL_MAXSIZE = int(os.getenv('AILAB_POOL_MAXSIZE', '32'))
+# 연결 단계 오류(DNS, TCP 연결 실패 등)에 대한 재시도 횟수와 백오프
+# 요청이 서버에 전달되기 전의 오류만 재시도하므로 POST 요청에도 안전합니다.
+AILAB_CONNECT_RETRIES = int(os.getenv('AILAB_CONNECT_RETRIES', '2'))
+AILAB_RETRY_BACKOFF = float(os.getenv('AILAB_RETRY_BACKOFF', '0.3'))
+# 멱등 GET(작업 결과 확인) 헤지 요청: 첫 요청이 최근 지연 시간의 AILAB_HEDGE_PERCENTILE 백분위보다
+# 오래 걸리면 같은 요청을 하나 더 보내 먼저 도착한 응답을 사용 (기본 꺼짐)
+AILAB_HEDGE_REQUESTS = os.getenv('AILAB_HEDGE_REQUESTS', '0') == '1'
+AILAB_HEDGE_PERCENTILE = float(os.getenv('AILAB_HEDGE_PERCENTILE', '95'))
+AILAB_HEDGE_WORKERS = int(os.getenv('AILAB_HEDGE_WORKERS', '16'))
+
+_session = None
+_session_lock = threading.Lock()
+_hedge_executor = None
+
+
+def _build_session():
+    retry = Retry(
+        total=AILAB_CONNECT_RETRIES,
+        connect=AILAB_CONNECT_RETRIES,
+        read=0,       # 응답 대기 중 오류는 재시도하지 않음 (작업 중복 제출 방지)
+        status=0,     # HTTP 상태 코드 기반 재시도 없음 (호출부에서 처리)
+        other=0,
+        backoff_factor=AILAB_RETRY_BACKOFF,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=AILAB_POOL_CONNECTIONS,
+        pool_maxsize=AILAB_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """모든 AILab 호출이 공유하는 requests.Session을 반환합니다.
+
+    같은 세션을 재사용하므로 호출/폴링마다 TCP+TLS 핸드셰이크를 새로 하지 않고
+    호스트별 풀에 남아 있는 keep-alive 커넥션을 사용합니다.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def ailab_post(url, breaker=None, **kwargs):
+    """공유 세션으로 POST 요청 (requests.post와 같은 인자, 호출 속도 제한 적용)
+
+    breaker(엔드포인트 이름)를 넘기면 그 엔드포인트의 회로 차단기를 거치며, 열려 있으면 CircuitOpen
+    """
+    return _send(get_session().post, url, breaker, kwargs)
+
+
+def ailab_get(url, breaker=None, **kwargs):
+    """공유 세션으로 GET 요청 (requests.get과 같은 인자, 호출 속도 제한 적용, breaker는 ailab_post와 같음)"""
+    return _send(get_session().get, url, breaker, kwargs)
+
+
+def ailab_get_hedged(url, breaker, **kwargs):
+    """멱등 GET 전용: 응답이 breaker의 최근 지연 백분위보다 늦으면 같은 요청을 한 번 더 보내 먼저 온 응답을 반환
+
+    AILAB_HEDGE_REQUESTS가 꺼져 있거나 지연 샘플이 부족하면 ailab_get과 같습니다.
+    늦게 도착한 쪽 응답은 버립니다. (requests는 진행 중인 요청을 취소할 수 없음)
+    """
+    circuit = get_breaker(breaker)
+    delay = circuit.hedge_delay(AILAB_HEDGE_PERCENTILE) if AILAB_HEDGE_REQUESTS else None
+    if delay is None:
+        return ailab_get(url, breaker=breaker, **kwargs)
+
+    executor = _get_hedge_executor()
+    primary = executor.submit(ailab_get, url, breaker=breaker, **kwargs)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+    hedge = executor.submit(ailab_get, url, breaker=breaker, **kwargs)
+    pending = {primary, hedge}
+    while True:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        # 먼저 끝난 쪽이 실패했고 다른 요청이 아직 진행 중이면 그 결과를 기다림
+        winner = next((future for future in done if future.exception() is None), None)
+        if winner is not None or not pending:
+            winner = winner or done.pop()
+            circuit.record_hedge(winner is hedge)
+            return winner.result()
+
+
+def _send(method, url, breaker, kwargs):
+    circuit = get_breaker(breaker) if breaker else None
+    if circuit is not None:
+        circuit.check() # 회로가 열려 있으면 호출 토큰을 쓰기 전에 바로 실패
+    get_governor().throttle()
+    if circuit is None:
+        return observe_rate_limit(method(url, **kwargs))
+    return observe_rate_limit(circuit.call(method, url, **kwargs))
+
+
+def _get_hedge_executor():
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _session_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(max_workers=AILAB_HEDGE_WORKERS, thread_name_prefix='ailab-hedge')
+    return _hedge_executor
+
+
+def observe_rate_limit(response):
+    """업스트림이 429로 응답하면 Retry-After(없으면 1초) 동안 모든 AILab 호출을 멈추도록 알림 (requests/httpx 응답 공용)"""
+    if response.status_code == 429:
+        get_governor().penalize(retry_after_seconds(response.headers.get('Retry-After')))
+    return response
+
+
+def retry_after_seconds(value, default=1.0):
+    """Retry-After 헤더(초 단위)를 숫자로 변환 (HTTP 날짜 형식 등 해석할 수 없으면 default)"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,20 @@
+# backend/asgi.py
+
+"""ASGI 진입점 (배포 시 실행: uvicorn asgi:application --host 0.0.0.0 --port 5001)
+
+변환 작업 SSE(/api/transform-jobs/<job_id>/events)는 JobEventsASGI가 uvicorn 이벤트 루프에서 직접 보내므로
+열린 스트림이 수천 개여도 스레드를 차지하지 않습니다.
+나머지 요청은 a2wsgi가 ASGI_WSGI_THREADS개 스레드 풀에서 Flask 앱으로 처리합니다.
+작업 상태는 프로세스 메모리에 있으므로 워커(--workers)는 하나로 실행합니다. (transform_jobs 참고)
+"""
+
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from app import app, allowed_origins, job_event_feed
+from job_events import JobEventsASGI
+
+ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', '16')) # Flask 라우트를 실행하는 스레드 수
+
+application = JobEventsASGI(WSGIMiddleware(app, workers=ASGI_WSGI_THREADS), job_event_feed, allowed_origins)
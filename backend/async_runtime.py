@@ -0,0 +1,67 @@
+# backend/async_runtime.py
+
+import asyncio
+import threading
+
+
+class AsyncRuntime:
+    """백그라운드 스레드 하나에서 asyncio 이벤트 루프를 돌리는 실행기
+
+    Flask 요청 스레드나 작업 스레드에서 코루틴을 넘기면 공용 이벤트 루프에서 실행합니다.
+    코루틴은 AILab 응답이나 다음 폴링 시각을 기다리는 동안 스레드를 붙잡지 않으므로,
+    진행 중인 작업이 수백 개여도 스레드는 루프 하나만 사용합니다.
+    """
+
+    def __init__(self, name='asyncio-runtime'):
+        self._name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._completed = 0
+
+    def submit(self, coro):
+        """코루틴을 이벤트 루프에 등록하고 concurrent.futures.Future를 반환합니다."""
+        self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(self._track(coro), self._loop)
+
+    def run(self, coro, timeout=None):
+        """코루틴을 이벤트 루프에서 실행하고 결과를 기다립니다. (호출한 스레드는 결과가 나올 때까지 대기)"""
+        return self.submit(coro).result(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'running': self._thread is not None,
+                'in_flight': self._in_flight,
+                'peak_in_flight': self._peak_in_flight,
+                'completed': self._completed,
+            }
+
+    async def _track(self, coro):
+        with self._lock:
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        try:
+            return await coro
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=self._run_loop, args=(loop,), name=self._name, daemon=True)
+                thread.start()
+                self._loop = loop
+                self._thread = thread
+
+    @staticmethod
+    def _run_loop(loop):
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
@@ -0,0 +1,101 @@
+# backend/autocomplete.py
+
+import os
+import threading
+
+from hangul import decompose, choseong
+
+# 노드마다 미리 골라 두는 최대 추천 개수 (요청의 limit은 이 값을 넘을 수 없음)
+AUTOCOMPLETE_MAX_K = int(os.getenv('AUTOCOMPLETE_MAX_K', '10'))
+
+# 추천 순위: 이름 앞부분 일치 > 중간 단어 앞부분 일치 > 초성 일치
+_RANK_NAME_PREFIX = 0
+_RANK_WORD_PREFIX = 1
+_RANK_CHOSEONG = 2
+
+
+def _key(text):
+    """트라이 키: 소문자 + 자모 분해 + 공백 제거 (입력 중인 음절 '폰'도 '포니'의 접두어가 됨)"""
+    return ''.join(decompose(text.lower()).split())
+
+
+class _Node:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.top = {}  # 생성 중: 이름 -> 순위 키, 생성 후: 순위순 이름 튜플
+
+
+class AutocompleteIndex:
+    """카탈로그 이름에 대한 접두어 트라이 (자동완성용)
+
+    이름 전체, 공백 뒤 각 단어, 초성 문자열('ㅍㄴㅌㅇ')을 모두 자모 단위 키로 넣고,
+    노드마다 상위 k개 이름을 미리 정렬해 두어 조회는 입력 길이만큼 내려가기만 하면 됩니다.
+    카탈로그 변경 리스너로 등록해 두면 카탈로그가 바뀔 때 다시 만들어집니다.
+    """
+
+    def __init__(self, max_k=AUTOCOMPLETE_MAX_K):
+        self.max_k = max_k
+        self._lock = threading.Lock()
+        self._root = _Node()
+        self.version = None
+        self._entries = 0
+
+    @property
+    def is_ready(self):
+        return self.version is not None
+
+    def rebuild(self, catalog_index):
+        """카탈로그 전체로 트라이를 다시 만듭니다. (카탈로그 변경 리스너)"""
+        root = _Node()
+        nodes = []
+        names = [row['name'] for row in catalog_index.rows()]
+        for name in names:
+            words = name.split()
+            for i in range(len(words)):
+                suffix = ' '.join(words[i:])
+                self._insert(root, _key(suffix), name, _RANK_NAME_PREFIX if i == 0 else _RANK_WORD_PREFIX, nodes)
+                self._insert(root, _key(choseong(suffix)), name, _RANK_CHOSEONG, nodes)
+
+        # 노드별 후보를 (순위, 길이, 이름) 순으로 정렬해 상위 k개만 남김
+        for node in nodes:
+            ranked = sorted(node.top.items(), key=lambda item: (item[1], len(item[0]), item[0]))
+            node.top = tuple(name for name, _ in ranked[:self.max_k])
+
+        with self._lock:
+            self._root = root
+            self.version = catalog_index.version
+            self._entries = len(names)
+        print(f"자동완성 트라이 생성 완료: 이름 {len(names)}개, 노드 {len(nodes)}개")
+
+    @staticmethod
+    def _insert(root, key, name, rank, nodes):
+        node = root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _Node()
+                nodes.append(child)
+            node = child
+            if rank < node.top.get(name, rank + 1):
+                node.top[name] = rank
+
+    def suggest(self, prefix, limit=AUTOCOMPLETE_MAX_K):
+        """입력한 접두어(음절/초성/혼합)로 시작하는 이름을 최대 limit개 반환합니다."""
+        key = _key(prefix or '')
+        if not key:
+            return []
+        node = self._root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return list(node.top[:min(limit, self.max_k)])
+
+    def stats(self):
+        return {
+            'ready': self.is_ready,
+            'version': self.version,
+            'entries': self._entries,
+        }
@@ -0,0 +1,243 @@
+# backend/catalog.py
+
+import bisect
+import hashlib
+import json
+import os
+import threading
+import time
+
+from sqlalchemy import select, update
+
+from extensions import db
+from models import Hairstyle, CatalogVersion
+
+# 카탈로그를 DB에서 다시 읽어 버전을 확인하는 주기(초)
+CATALOG_REFRESH_SECONDS = int(os.getenv('CATALOG_REFRESH_SECONDS', '300'))
+# 다른 프로세스(시드 스크립트, CLI)가 남긴 카탈로그 변경 표시(CatalogVersion)를 확인하는 주기(초)
+CATALOG_VERSION_CHECK_SECONDS = float(os.getenv('CATALOG_VERSION_CHECK_SECONDS', '2'))
+
+# 카탈로그 한 행에 담는 필드 (검색 API 응답과 동일)
+CATALOG_FIELDS = ('id', 'name', 'description', 'image_url', 'image_variants', 'brand_price', 'normal_price',
+                  'similar_styles_description')
+
+
+def serialize_hairstyle(style):
+    """Hairstyle 모델 객체를 dict로 변환"""
+    return {field: getattr(style, field) for field in CATALOG_FIELDS}
+
+
+def mark_catalog_changed(session):
+    """카탈로그를 바꾼 트랜잭션 안에서 호출해 변경 표시(CatalogVersion.version)를 올립니다.
+
+    커밋되면 실행 중인 모든 서버 프로세스가 CATALOG_VERSION_CHECK_SECONDS 안에 카탈로그를 다시 읽습니다.
+    """
+    result = session.execute(update(CatalogVersion).where(CatalogVersion.id == 1)
+                             .values(version=CatalogVersion.version + 1))
+    if not result.rowcount:
+        session.add(CatalogVersion(id=1, version=1))
+
+
+def read_catalog_version(session):
+    """현재 카탈로그 변경 표시 (행이 없으면 0)"""
+    return session.execute(select(CatalogVersion.version).where(CatalogVersion.id == 1)).scalar() or 0
+
+
+def parse_fields(value):
+    """fields 쿼리 파라미터('id,name,image_url')를 검증해 필드 튜플로 변환 (없으면 전체 필드)
+
+    알 수 없는 필드가 있으면 ValueError를 발생시킵니다.
+    """
+    if not value:
+        return CATALOG_FIELDS
+    fields = tuple(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in CATALOG_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"알 수 없는 필드입니다: {', '.join(unknown)} (사용 가능: {', '.join(CATALOG_FIELDS)})")
+    return fields
+
+
+def project(row, fields):
+    """카탈로그 행에서 요청한 필드만 남긴 dict"""
+    if fields is CATALOG_FIELDS:
+        return row
+    return {field: row[field] for field in fields}
+
+
+class CatalogIndex:
+    """헤어스타일 카탈로그 전체를 프로세스 메모리에 올려 둔 인덱스
+
+    카탈로그는 작고 거의 읽기만 하므로, 한국어 이름과 API value 양쪽을 키로 바로 찾을 수 있게
+    메모리에 보관해 미리보기/추천 요청이 DB를 거치지 않도록 합니다.
+    - CATALOG_REFRESH_SECONDS마다 DB를 다시 읽어 내용 해시(version)가 바뀌었을 때만 교체
+    - CATALOG_VERSION_CHECK_SECONDS마다 변경 표시(CatalogVersion, 기본 키 조회 한 번)를 확인해
+      다른 프로세스가 mark_catalog_changed로 올렸으면 다음 조회 때 바로 다시 읽음 (시드 스크립트, CLI)
+    - invalidate()는 같은 프로세스 안에서만 다음 조회 때 다시 읽도록 표시
+    - 아직 읽지 못한 상태(cold)에서 DB 로드도 실패하면 DB를 직접 조회하는 방식으로 대체
+    - add_listener()로 등록한 함수는 카탈로그 내용이 바뀔 때마다 호출됨
+    DB 조회가 필요하므로 앱 컨텍스트 안에서 사용해야 합니다.
+    """
+
+    def __init__(self, name_map, refresh_seconds=CATALOG_REFRESH_SECONDS,
+                 version_check_seconds=CATALOG_VERSION_CHECK_SECONDS):
+        self._name_map = name_map  # API value -> 한국어 이름
+        self._refresh_seconds = refresh_seconds
+        self._version_check_seconds = version_check_seconds
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._listeners = []
+        self._rows = []
+        self._names = []          # _rows와 같은 순서의 이름 목록 (키셋 페이지 탐색용)
+        self._by_name = {}
+        self._by_value = {}
+        self.version = None
+        self.loaded_at = None     # 마지막으로 DB를 확인한 시각 (monotonic)
+        self.changed_at = None    # 내용이 마지막으로 바뀐 시각 (epoch, Last-Modified 용)
+        self._stale = True
+        self._change_mark = None       # 마지막 로드 때 읽은 변경 표시 (CatalogVersion.version)
+        self._mark_checked_at = None   # 변경 표시를 마지막으로 확인한 시각 (monotonic)
+        self._mark_error_logged = False
+
+    @property
+    def is_warm(self):
+        return self.version is not None
+
+    def add_listener(self, listener):
+        """카탈로그가 바뀔 때 listener(catalog_index)를 호출하도록 등록"""
+        self._listeners.append(listener)
+
+    def invalidate(self):
+        """이 프로세스의 인덱스를 다음 조회 때 DB에서 다시 읽도록 표시
+
+        다른 프로세스의 인덱스에는 영향이 없으므로, 카탈로그를 바꾸는 스크립트는 mark_catalog_changed를 사용합니다.
+        """
+        self._stale = True
+
+    def load(self):
+        """DB에서 카탈로그 전체를 읽어 인덱스를 다시 만듭니다. 내용이 바뀌었으면 True"""
+        # 변경 표시를 먼저 읽음 (읽는 도중 표시가 올라가면 다음 확인 때 다시 읽도록)
+        change_mark = self._read_change_mark()
+        styles = Hairstyle.query.order_by(Hairstyle.name, Hairstyle.id).all()
+        rows = [serialize_hairstyle(style) for style in styles]
+        # DB 정렬 규칙(collation)과 관계없이 파이썬 문자열 순서로 정렬 (page_after의 이진 탐색 기준)
+        rows.sort(key=lambda row: row['name'])
+        version = hashlib.sha1(json.dumps(rows, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+        with self._lock:
+            self.loaded_at = self._mark_checked_at = time.monotonic()
+            self._stale = False
+            self._change_mark = change_mark
+            if version == self.version:
+                return False
+            by_name = {row['name']: row for row in rows}
+            self._by_value = {value: by_name[name] for value, name in self._name_map.items() if name in by_name}
+            self._by_name = by_name
+            self._rows = rows
+            self._names = [row['name'] for row in rows]
+            self.version = version
+            self.changed_at = time.time()
+        print(f"헤어스타일 카탈로그 로드 완료: {len(rows)}개 (version: {version})")
+
+        for listener in self._listeners:
+            try:
+                listener(self)
+            except Exception as e:
+                print(f"카탈로그 변경 리스너 오류: {e}")
+        return True
+
+    def _needs_refresh(self):
+        return self._stale or self.loaded_at is None \
+            or time.monotonic() - self.loaded_at >= self._refresh_seconds
+
+    def _read_change_mark(self):
+        try:
+            return read_catalog_version(db.session)
+        except Exception as e:
+            # catalog_version 테이블이 아직 없는 DB (마이그레이션 전): 주기적 재로드만 사용
+            db.session.rollback()
+            if not self._mark_error_logged:
+                self._mark_error_logged = True
+                print(f"카탈로그 변경 표시 확인 실패 (CATALOG_REFRESH_SECONDS 주기로만 갱신): {e}")
+            return None
+
+    def _check_change_mark(self):
+        """변경 표시 확인 주기가 지났으면 표시를 읽어, 마지막 로드 이후 올라갔으면 stale로 표시"""
+        checked_at = self._mark_checked_at
+        if checked_at is not None and time.monotonic() - checked_at < self._version_check_seconds:
+            return
+        # 이미 다른 스레드가 읽는 중이면 건너뜀 (요청마다 조회가 몰리지 않도록)
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self._mark_checked_at = time.monotonic()
+            change_mark = self._read_change_mark()
+            if change_mark is not None and change_mark != self._change_mark:
+                self._stale = True
+        finally:
+            self._refresh_lock.release()
+
+    def ensure_fresh(self):
+        """인덱스가 비었거나 오래됐거나 다른 프로세스가 카탈로그를 바꿨으면 다시 읽습니다. 실패해도 기존 인덱스는 유지"""
+        if self.is_warm:
+            self._check_change_mark()
+        if not self._needs_refresh():
+            return self.is_warm
+        # 이미 다른 스레드가 읽는 중이면, 인덱스가 있는 경우 기다리지 않고 기존 인덱스 사용
+        if not self._refresh_lock.acquire(blocking=not self.is_warm):
+            return self.is_warm
+        try:
+            if self._needs_refresh():
+                self.load()
+        except Exception as e:
+            print(f"카탈로그 로드 실패: {e}")
+            self.loaded_at = time.monotonic() # 실패 시에도 매 요청마다 재시도하지 않도록
+            self._stale = False
+        finally:
+            self._refresh_lock.release()
+        return self.is_warm
+
+    def rows(self):
+        """이름순으로 정렬된 전체 카탈로그 (읽기 전용으로 사용)"""
+        self.ensure_fresh()
+        return self._rows
+
+    def page_after(self, after_name, limit):
+        """이름순으로 after_name 다음부터 limit개 (after_name이 None이면 처음부터)
+
+        이름은 unique이므로 이름 자체를 키셋 커서로 사용하며, 위치는 이진 탐색으로 찾습니다.
+        """
+        self.ensure_fresh()
+        with self._lock:
+            rows, names = self._rows, self._names
+        start = 0 if after_name is None else bisect.bisect_right(names, after_name)
+        return rows[start:start + limit]
+
+    def find_by_name(self, name):
+        """한국어 이름으로 조회 (없으면 None)"""
+        if self.ensure_fresh():
+            return self._by_name.get(name)
+        style = Hairstyle.query.filter_by(name=name).first()
+        return serialize_hairstyle(style) if style else None
+
+    def find_by_value(self, value):
+        """API value로 조회 (없으면 None)"""
+        if self.ensure_fresh():
+            return self._by_value.get(value)
+        name = self._name_map.get(value)
+        return self.find_by_name(name) if name else None
+
+    def images_for(self, names):
+        """한국어 이름 목록 -> {이름: (image_url, image_variants)}"""
+        if self.ensure_fresh():
+            return {name: (self._by_name[name]['image_url'], self._by_name[name]['image_variants'])
+                    for name in names if name in self._by_name}
+        found_styles = Hairstyle.query.filter(Hairstyle.name.in_(names)).all()
+        return {style.name: (style.image_url, style.image_variants) for style in found_styles}
+
+    def stats(self):
+        return {
+            'warm': self.is_warm,
+            'version': self.version,
+            'entries': len(self._rows),
+            'change_mark': self._change_mark,
+        }
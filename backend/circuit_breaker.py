@@ -0,0 +1,236 @@
+# backend/circuit_breaker.py
+
+import math
+import os
+import threading
+import time
+from collections import deque
+
+# --- 엔드포인트별 회로 차단기 설정 ---
+CIRCUIT_WINDOW_SECONDS = float(os.getenv('CIRCUIT_WINDOW_SECONDS', '30'))      # 오류율/지연을 계산하는 최근 구간(초)
+CIRCUIT_MIN_CALLS = int(os.getenv('CIRCUIT_MIN_CALLS', '10'))                  # 이보다 호출이 적으면 판단하지 않음
+CIRCUIT_FAILURE_RATE = float(os.getenv('CIRCUIT_FAILURE_RATE', '0.5'))         # 실패(예외/5xx) 비율이 이 이상이면 차단
+CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv('CIRCUIT_SLOW_CALL_SECONDS', '10'))  # 이보다 오래 걸린 호출은 느린 호출
+CIRCUIT_SLOW_CALL_RATE = float(os.getenv('CIRCUIT_SLOW_CALL_RATE', '0.8'))     # 느린 호출 비율이 이 이상이면 차단
+CIRCUIT_OPEN_SECONDS = float(os.getenv('CIRCUIT_OPEN_SECONDS', '20'))          # 차단 후 시험 호출까지 기다리는 시간(초)
+CIRCUIT_HALF_OPEN_CALLS = int(os.getenv('CIRCUIT_HALF_OPEN_CALLS', '2'))       # 시험 호출 수 (모두 성공하면 복구)
+
+# 구간 안에 기억하는 최대 호출 수 (지연 백분위 계산용 샘플 포함)
+_MAX_SAMPLES = 1000
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+class CircuitOpen(Exception):
+    """회로가 열려 있어 호출하지 않고 바로 실패할 때 발생 (retry_after: 시험 호출이 가능해질 때까지 남은 초)"""
+
+    def __init__(self, name, retry_after,
+                 message="AILab 서비스 응답이 원활하지 않아 요청을 처리할 수 없습니다. 잠시 후 다시 시도해주세요."):
+        super().__init__(f"{message} (endpoint: {name})")
+        self.name = name
+        self.retry_after = retry_after
+        self.message = message
+
+
+class CircuitBreaker:
+    """AILab 엔드포인트 하나의 회로 차단기 (closed -> open -> half_open -> closed)
+
+    - closed: 모든 호출을 보내고, 최근 CIRCUIT_WINDOW_SECONDS 동안의 실패율과 느린 호출 비율을 기록
+      둘 중 하나라도 기준을 넘으면 open
+    - open: CIRCUIT_OPEN_SECONDS 동안 호출하지 않고 CircuitOpen으로 바로 실패 (30초 타임아웃을 기다리지 않음)
+    - half_open: 시험 호출 CIRCUIT_HALF_OPEN_CALLS개만 보내고, 모두 성공하면 closed, 하나라도 실패하면 다시 open
+    실패는 예외(연결 오류/타임아웃)와 5xx 응답입니다. 4xx(429 포함)는 업스트림이 정상 응답한 것으로 봅니다.
+    성공한 호출의 지연 시간으로 백분위를 계산해 헤지 요청 시점(hedge_delay)도 제공합니다.
+    """
+
+    def __init__(self, name, window_seconds=CIRCUIT_WINDOW_SECONDS, min_calls=CIRCUIT_MIN_CALLS,
+                 failure_rate=CIRCUIT_FAILURE_RATE, slow_call_seconds=CIRCUIT_SLOW_CALL_SECONDS,
+                 slow_call_rate=CIRCUIT_SLOW_CALL_RATE, open_seconds=CIRCUIT_OPEN_SECONDS,
+                 half_open_calls=CIRCUIT_HALF_OPEN_CALLS):
+        self.name = name
+        self._window_seconds = window_seconds
+        self._min_calls = min_calls
+        self._failure_rate = failure_rate
+        self._slow_call_seconds = slow_call_seconds
+        self._slow_call_rate = slow_call_rate
+        self._open_seconds = open_seconds
+        self._half_open_calls = half_open_calls
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._generation = 0  # 상태가 바뀔 때마다 증가 (이전 상태에서 시작한 호출의 결과는 판단에 쓰지 않음)
+        self._calls = deque(maxlen=_MAX_SAMPLES)  # (끝난 시각, 지연 초, 실패 여부)
+        self._opened_until = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        # 통계
+        self.opened = 0
+        self.rejected = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def check(self):
+        """회로가 열려 있으면 CircuitOpen을 발생시킵니다. (호출 전에 미리 거절할 때 사용, 시험 호출 자리는 쓰지 않음)"""
+        with self._lock:
+            if self._state == STATE_OPEN and time.monotonic() < self._opened_until:
+                self.rejected += 1
+                raise CircuitOpen(self.name, self._retry_after())
+
+    def call(self, send, *args, **kwargs):
+        """send(*args, **kwargs)를 회로 차단기를 거쳐 호출하고 응답을 반환합니다."""
+        generation = self._before_call()
+        started = time.monotonic()
+        failed = None
+        try:
+            response = send(*args, **kwargs)
+            failed = response.status_code >= 500
+            return response
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._after_call(generation, time.monotonic() - started, failed)
+
+    async def call_async(self, send, *args, **kwargs):
+        """call의 asyncio 버전 (send는 코루틴 함수, 취소된 호출은 성공/실패로 세지 않음)"""
+        generation = self._before_call()
+        started = time.monotonic()
+        failed = None
+        try:
+            response = await send(*args, **kwargs)
+            failed = response.status_code >= 500
+            return response
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._after_call(generation, time.monotonic() - started, failed)
+
+    def hedge_delay(self, percentile):
+        """성공한 호출 지연 시간의 percentile 백분위(초). 회로가 닫혀 있지 않거나 샘플이 부족하면 None"""
+        with self._lock:
+            if self._state != STATE_CLOSED:
+                return None
+            self._prune(time.monotonic())
+            latencies = sorted(latency for _, latency, failed in self._calls if not failed)
+        if len(latencies) < self._min_calls:
+            return None
+        index = min(len(latencies) - 1, math.ceil(percentile / 100 * len(latencies)) - 1)
+        return latencies[max(0, index)]
+
+    def record_hedge(self, won):
+        """헤지 요청을 보냈음을 기록 (won: 헤지 요청이 먼저 끝났으면 True)"""
+        with self._lock:
+            self.hedged += 1
+            if won:
+                self.hedge_wins += 1
+
+    def stats(self):
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            total = len(self._calls)
+            failures = sum(1 for _, _, failed in self._calls if failed)
+            slow = sum(1 for _, latency, _ in self._calls if latency >= self._slow_call_seconds)
+            return {
+                'state': self._state,
+                'calls': total,
+                'failure_rate': round(failures / total, 3) if total else 0.0,
+                'slow_call_rate': round(slow / total, 3) if total else 0.0,
+                'retry_after': self._retry_after() if self._state == STATE_OPEN else 0,
+                'opened': self.opened,
+                'rejected': self.rejected,
+                'hedged': self.hedged,
+                'hedge_wins': self.hedge_wins,
+            }
+
+    def _before_call(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._state == STATE_OPEN:
+                if now < self._opened_until:
+                    self.rejected += 1
+                    raise CircuitOpen(self.name, self._retry_after())
+                self._transition(STATE_HALF_OPEN)
+                print(f"회로 차단기 시험 호출 시작 ({self.name})")
+            if self._state == STATE_HALF_OPEN:
+                if self._probes_in_flight + self._probe_successes >= self._half_open_calls:
+                    self.rejected += 1
+                    raise CircuitOpen(self.name, 1)
+                self._probes_in_flight += 1
+            return self._generation
+
+    def _after_call(self, generation, latency, failed):
+        with self._lock:
+            if generation != self._generation:
+                return
+            now = time.monotonic()
+            if self._state == STATE_HALF_OPEN:
+                self._probes_in_flight -= 1
+                if failed is None:
+                    return # 취소된 시험 호출: 자리만 반환
+                if failed or latency >= self._slow_call_seconds:
+                    self._open(now)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self._half_open_calls:
+                    self._transition(STATE_CLOSED)
+                    print(f"회로 차단기 복구 ({self.name})")
+                return
+            if failed is None:
+                return
+            self._calls.append((now, latency, failed))
+            self._prune(now)
+            total = len(self._calls)
+            if total < self._min_calls:
+                return
+            failures = sum(1 for _, _, call_failed in self._calls if call_failed)
+            slow = sum(1 for _, call_latency, _ in self._calls if call_latency >= self._slow_call_seconds)
+            if failures / total >= self._failure_rate or slow / total >= self._slow_call_rate:
+                self._open(now)
+
+    def _open(self, now):
+        # self._lock을 잡은 상태에서 호출
+        self._transition(STATE_OPEN)
+        self._opened_until = now + self._open_seconds
+        self.opened += 1
+        print(f"회로 차단기 열림 ({self.name}): {self._open_seconds:.0f}초 동안 호출 중단")
+
+    def _transition(self, state):
+        # self._lock을 잡은 상태에서 호출
+        self._state = state
+        self._generation += 1
+        if state == STATE_CLOSED:
+            self._calls.clear() # 복구되면 새 구간에서 다시 판단 (열려 있는 동안은 모니터링용으로 남겨 둠)
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    def _prune(self, now):
+        # self._lock을 잡은 상태에서 호출
+        while self._calls and self._calls[0][0] < now - self._window_seconds:
+            self._calls.popleft()
+
+    def _retry_after(self):
+        # self._lock을 잡은 상태에서 호출
+        return max(1, math.ceil(self._opened_until - time.monotonic()))
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """엔드포인트 이름별 CircuitBreaker를 반환합니다. (처음 요청할 때 생성)"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(name, CircuitBreaker(name))
+    return breaker
+
+
+def breaker_stats():
+    """모든 회로 차단기의 상태 {이름: stats}"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
@@ -0,0 +1,105 @@
+# backend/compression.py
+
+import gzip
+import os
+from flask import request
+
+from ttl_cache import TTLCache
+
+try:
+    import brotli # 선택 의존성: 설치되어 있으면 br 인코딩도 지원
+except ImportError:
+    brotli = None
+
+# 이 크기(bytes) 미만의 응답은 압축하지 않음 (헤더/CPU 비용이 더 큼)
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+# ETag가 있는 응답(카탈로그 응답)의 압축 결과를 보관할 최대 개수
+COMPRESS_CACHE_MAX_ENTRIES = int(os.getenv('COMPRESS_CACHE_MAX_ENTRIES', '512'))
+
+_COMPRESSIBLE_MIMETYPES = {'application/json', 'application/javascript', 'text/html', 'text/css',
+                           'text/plain', 'text/javascript', 'image/svg+xml'}
+
+# 매번 압축하는 응답은 빠른 설정, 한 번 압축해 캐시하는 응답은 높은 압축률 설정 사용
+_GZIP_LEVEL = {False: 6, True: 9}
+_BROTLI_QUALITY = {False: 5, True: 11}
+
+
+class ResponseCompressor:
+    """Accept-Encoding에 따라 응답 본문을 brotli/gzip으로 압축하는 after_request 훅
+
+    - 압축 가능한 타입이면서 COMPRESS_MIN_SIZE 이상인 200 응답만 압축
+    - 파일 전송(send_from_directory 등)/스트리밍 응답과 304 응답은 건드리지 않음
+    - ETag가 있는 응답(카탈로그 버전 기반)은 URL + ETag + 인코딩별로 압축 결과를 캐시해 재사용하며,
+      압축본에는 약한 ETag(W/)를 붙여 조건부 GET(If-None-Match)은 그대로 동작
+    """
+
+    def __init__(self, app=None, min_size=COMPRESS_MIN_SIZE, cache_max_entries=COMPRESS_CACHE_MAX_ENTRIES):
+        self.min_size = min_size
+        self._cache = TTLCache(max_entries=cache_max_entries, ttl_seconds=86400)
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.after_request(self.after_request)
+
+    def after_request(self, response):
+        if response.mimetype not in _COMPRESSIBLE_MIMETYPES:
+            return response
+        response.vary.add('Accept-Encoding') # 캐시가 인코딩별로 응답을 구분하도록 항상 표시
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        encoding = self._choose_encoding()
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            cache_key = (request.full_path, etag, encoding)
+            compressed = self._cache.get(cache_key)
+            if compressed is None:
+                compressed = self._compress(data, encoding, cacheable=True)
+                self._cache.set(cache_key, compressed)
+            response.set_etag(etag, weak=True) # 원본과 바이트가 다르므로 약한 ETag로 표시
+        else:
+            compressed = self._compress(data, encoding, cacheable=False)
+
+        if len(compressed) >= len(data):
+            return response
+        response.set_data(compressed) # Content-Length도 함께 갱신됨
+        response.headers['Content-Encoding'] = encoding
+        self.compressed += 1
+        self.bytes_in += len(data)
+        self.bytes_out += len(compressed)
+        return response
+
+    def _choose_encoding(self):
+        accept = request.accept_encodings
+        if brotli is not None and accept['br']:
+            return 'br'
+        if accept['gzip']:
+            return 'gzip'
+        return None
+
+    @staticmethod
+    def _compress(data, encoding, cacheable):
+        if encoding == 'br':
+            return brotli.compress(data, quality=_BROTLI_QUALITY[cacheable])
+        return gzip.compress(data, compresslevel=_GZIP_LEVEL[cacheable], mtime=0)
+
+    def stats(self):
+        return {
+            'brotli': brotli is not None,
+            'compressed_responses': self.compressed,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'ratio': round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None,
+            'variant_cache': self._cache.stats(),
+        }
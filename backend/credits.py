@@ -0,0 +1,285 @@
+# backend/credits.py
+
+import atexit
+import os
+import threading
+import time
+from sqlalchemy import update, select
+
+from extensions import db
+from models import User
+
+# --- 크레딧 정산 설정 ---
+CREDITS_FLUSH_INTERVAL = float(os.getenv('CREDITS_FLUSH_INTERVAL', '5'))    # 사용 확정된 크레딧을 모아 DB에 차감하는 주기(초)
+CREDITS_IDLE_SECONDS = float(os.getenv('CREDITS_IDLE_SECONDS', '60'))       # 이 시간 동안 쓰지 않은 사용자는 장부에서 제거
+
+
+class CreditError(Exception):
+    """크레딧을 예약할 수 없을 때 발생 (메시지는 사용자에게 그대로 전달)"""
+
+    def __init__(self, message, status_code=402):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class CreditReservation:
+    """작업 하나에 예약한 크레딧 - settle(사용 확정) 또는 refund(반환) 중 먼저 호출한 것만 반영"""
+
+    def __init__(self, ledger, account, amount):
+        self._ledger = ledger
+        self._account = account
+        self.amount = amount
+        self._finished = False
+
+    def settle(self):
+        """작업이 성공해 크레딧 사용을 확정합니다."""
+        self._finish(refund=False)
+
+    def refund(self):
+        """작업이 실패했거나 실행되지 않아 크레딧을 돌려줍니다."""
+        self._finish(refund=True)
+
+    def finish(self, result):
+        """작업 결과 dict에 따라 정산 (오류가 없으면 settle, 있으면 refund) - TransformJobStore의 on_done 콜백용"""
+        self._finish(refund=bool(result.get("error")))
+
+    def _finish(self, refund):
+        if self._ledger is None:
+            return # 크레딧을 쓰지 않는 설정 (CREDITS_ENABLED가 꺼져 있음)
+        with self._account.lock:
+            if self._finished:
+                return
+            self._finished = True
+            self._account.reserved -= self.amount
+            if not refund:
+                self._account.pending += self.amount
+        self._ledger._finished(self.amount, refund)
+
+
+class _Account:
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.lock = threading.Lock()
+        self.balance = None  # 마지막으로 읽은 DB 잔액 (User.credits)
+        self.reserved = 0    # 진행 중인 작업에 예약된 크레딧
+        self.pending = 0     # 사용 확정되었지만 아직 DB에 차감하지 않은 크레딧
+        self.flushing = 0    # DB에 차감하는 중인 크레딧 (flush 트랜잭션이 끝나면 balance에 반영)
+        self.last_used = time.monotonic()
+        self.removed = False  # 장부에서 뺀 경우 (새 예약은 새 계정 객체로)
+
+    def available(self):
+        return self.balance - self.reserved - self.pending - self.flushing
+
+
+class CreditLedger:
+    """User.credits를 요청마다 UPDATE하지 않고 모아서 차감하는 프로세스 내 크레딧 장부
+
+    요청마다 `UPDATE user SET credits = credits - 1`을 하면 같은 사용자의 배치 요청이 한 행에서 줄을 서므로,
+    - 작업 등록 시 DB 잔액에서 예약분과 미반영 사용분을 뺀 만큼 안에서 메모리로만 예약(reserve)하고
+    - 작업이 끝나면 사용 확정(settle, 미반영 사용분에 더함) 또는 예약 취소(refund)하며
+    - 백그라운드 스레드가 CREDITS_FLUSH_INTERVAL마다 사용자별 사용분을 한 트랜잭션에서
+      `UPDATE ... SET credits = credits - n WHERE credits >= n`으로 차감하고 잔액을 다시 읽습니다. (종료 시에도 반영)
+    DB에서는 사용한 크레딧만 빠지므로, 프로세스가 비정상 종료되어도 사용자의 크레딧은 사라지지 않습니다.
+    (잃는 것은 마지막 주기 동안 사용 확정되고 아직 차감하지 않은 크레딧 - 사용자가 무료로 받은 변환)
+    조건부 UPDATE라 잔액은 음수가 되지 않습니다. 프로세스가 여러 개이면 각자 읽은 잔액으로 예약하므로
+    한 주기 안에 잔액보다 많이 쓸 수 있고, 그때는 남은 잔액만 차감하고 나머지는 uncollected로 기록합니다.
+    """
+
+    def __init__(self, app, enabled=True, flush_interval=CREDITS_FLUSH_INTERVAL, idle_seconds=CREDITS_IDLE_SECONDS):
+        self._app = app
+        self.enabled = enabled
+        self._flush_interval = flush_interval
+        self._idle_seconds = idle_seconds
+        self._accounts = {}  # user_id -> _Account
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # flush는 한 번에 하나만 (계정의 flushing을 덮어쓰지 않도록)
+        self._thread = None
+        # 통계
+        self.reserved = 0
+        self.settled = 0
+        self.refunded = 0
+        self.insufficient = 0
+        self.charged = 0
+        self.uncollected = 0
+        self.flushes = 0
+
+    def reserve(self, user_id, amount=1, count=1):
+        """user_id의 크레딧을 amount씩 count개 예약하고 CreditReservation 목록을 반환합니다.
+
+        count개를 모두 예약하거나 하나도 예약하지 않습니다. (로그인하지 않았으면 401, 잔액이 부족하면 402 CreditError)
+        크레딧을 쓰지 않는 설정이면 아무것도 차감하지 않는 예약을 반환합니다.
+        DB를 조회할 수 있으므로 앱 컨텍스트(요청 스레드) 안에서 호출해야 합니다.
+        """
+        if not self.enabled:
+            return [CreditReservation(None, None, 0) for _ in range(count)]
+        if user_id is None:
+            raise CreditError("로그인이 필요합니다.", 401)
+
+        total = amount * count
+        while True:
+            account = self._account(user_id)
+            with account.lock:
+                if account.removed:
+                    continue # 방금 장부에서 빠진 계정: 새 계정으로 다시
+                if account.balance is None or account.available() < total:
+                    # 처음 예약하거나 모자랄 때만 DB 잔액을 다시 읽음 (충전/다른 프로세스의 차감 반영)
+                    # (같은 사용자의 다른 요청은 그동안 이 계정 잠금에서 대기)
+                    account.balance = self._read_balance(user_id)
+                if account.available() < total:
+                    with self._lock:
+                        self.insufficient += 1
+                    raise CreditError("크레딧이 부족합니다.")
+                account.reserved += total
+                account.last_used = time.monotonic()
+                break
+
+        with self._lock:
+            self.reserved += total
+        self._ensure_flusher()
+        return [CreditReservation(self, account, amount) for _ in range(count)]
+
+    def reserve_one(self, user_id, amount=1):
+        """크레딧 amount를 예약하고 CreditReservation 하나를 반환합니다. (reserve와 같은 예외)"""
+        return self.reserve(user_id, amount)[0]
+
+    def flush(self):
+        """사용 확정된 크레딧을 DB에서 차감하고, 장부에 있는 사용자들의 잔액을 다시 읽습니다.
+
+        모든 사용자의 차감과 잔액 조회를 한 트랜잭션에서 합니다. 앱 컨텍스트 안에서 호출해야 합니다.
+        """
+        with self._flush_lock:
+            with self._lock:
+                accounts = list(self._accounts.values())
+            if not accounts:
+                return
+            for account in accounts:
+                with account.lock:
+                    account.flushing, account.pending = account.pending, 0
+            settled = {account.user_id: account.flushing for account in accounts if account.flushing}
+
+            try:
+                with db.engine.begin() as connection:
+                    uncollected = self._charge(connection, settled)
+                    user_table = User.__table__
+                    balances = dict(connection.execute(
+                        select(user_table.c.id, user_table.c.credits)
+                        .where(user_table.c.id.in_([account.user_id for account in accounts]))
+                    ).all())
+            except Exception as e:
+                print(f"사용 크레딧 차감 실패 ({len(settled)}명): {e}")
+                for account in accounts:
+                    with account.lock:
+                        account.pending += account.flushing
+                        account.flushing = 0
+                return
+
+            for account in accounts:
+                with account.lock:
+                    account.balance = balances.get(account.user_id, 0)
+                    account.flushing = 0
+            with self._lock:
+                self.flushes += 1
+                self.charged += sum(settled.values()) - sum(uncollected.values())
+                self.uncollected += sum(uncollected.values())
+            for user_id, amount in uncollected.items():
+                print(f"잔액 부족으로 차감하지 못한 크레딧: 사용자 {user_id}, {amount}")
+
+            # 예약도 미반영 사용분도 없는 유휴 계정은 목록에서 제거 (잠금 순서: 계정 -> 장부, reserve와 같음)
+            now = time.monotonic()
+            for account in accounts:
+                with account.lock:
+                    if account.reserved or account.pending or now - account.last_used < self._idle_seconds:
+                        continue
+                    account.removed = True
+                with self._lock:
+                    if self._accounts.get(account.user_id) is account:
+                        del self._accounts[account.user_id]
+
+    def stats(self):
+        with self._lock:
+            accounts = list(self._accounts.values())
+            stats = {
+                'enabled': self.enabled,
+                'accounts': len(accounts),
+                'reserved_total': self.reserved,
+                'settled': self.settled,
+                'refunded': self.refunded,
+                'insufficient': self.insufficient,
+                'charged_to_db': self.charged,
+                'uncollected': self.uncollected,
+                'flushes': self.flushes,
+            }
+        stats['in_flight'] = sum(account.reserved for account in accounts)
+        stats['pending'] = sum(account.pending + account.flushing for account in accounts)
+        return stats
+
+    def _account(self, user_id):
+        with self._lock:
+            account = self._accounts.get(user_id)
+            if account is None:
+                account = self._accounts[user_id] = _Account(user_id)
+            return account
+
+    @staticmethod
+    def _read_balance(user_id):
+        user_table = User.__table__
+        with db.engine.connect() as connection:
+            balance = connection.execute(select(user_table.c.credits).where(user_table.c.id == user_id)).scalar()
+        return balance or 0
+
+    @staticmethod
+    def _charge(connection, settled):
+        """settled {user_id: 사용 크레딧}을 조건부 UPDATE로 차감하고, 잔액이 모자라 차감하지 못한 양을 반환합니다."""
+        user_table = User.__table__
+        uncollected = {}
+        for user_id, amount in settled.items():
+            result = connection.execute(
+                update(user_table)
+                .where(user_table.c.id == user_id, user_table.c.credits >= amount)
+                .values(credits=user_table.c.credits - amount)
+            )
+            if result.rowcount:
+                continue
+            # 다른 프로세스가 같은 주기에 먼저 차감해 잔액이 모자람: 남은 잔액만 차감
+            balance = connection.execute(select(user_table.c.credits).where(user_table.c.id == user_id)).scalar() or 0
+            if balance > 0:
+                result = connection.execute(
+                    update(user_table)
+                    .where(user_table.c.id == user_id, user_table.c.credits >= balance)
+                    .values(credits=user_table.c.credits - balance)
+                )
+                if not result.rowcount:
+                    balance = 0
+            uncollected[user_id] = amount - max(balance, 0)
+        return uncollected
+
+    def _finished(self, amount, refund):
+        with self._lock:
+            if refund:
+                self.refunded += amount
+            else:
+                self.settled += amount
+
+    def _ensure_flusher(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._flush_loop, name='credit-flush', daemon=True)
+                self._thread.start()
+                atexit.register(self._flush_all)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self._flush_interval)
+            try:
+                with self._app.app_context():
+                    self.flush()
+            except Exception as e:
+                print(f"크레딧 차감 스레드 오류: {e}")
+
+    def _flush_all(self):
+        # 프로세스 종료 시: 사용 확정된 크레딧을 DB에 반영 (진행 중인 작업의 예약분은 차감하지 않음)
+        with self._app.app_context():
+            self.flush()
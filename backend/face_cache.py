@@ -0,0 +1,93 @@
+# backend/face_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from PIL import Image, ImageOps
+
+
+def dhash(image_stream, hash_size=8):
+    """이미지의 difference hash(dHash)를 64비트 정수로 계산합니다.
+
+    이미지를 (hash_size+1) x hash_size 흑백으로 줄인 뒤 가로로 이웃한 픽셀의 밝기 차이만 비교하므로
+    같은 사진을 다시 저장(JPEG 재인코딩)하거나 크기를 바꿔도 해시가 거의 같게 나옵니다.
+    계산할 수 없는 이미지면 None을 반환합니다.
+    """
+    try:
+        image_stream.seek(0)
+        img = Image.open(image_stream)
+        img.draft('L', (hash_size * 8, hash_size * 8))  # JPEG는 축소된 크기로 디코딩 (속도 향상)
+        img = ImageOps.exif_transpose(img).convert('L').resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+        pixels = list(img.getdata())
+    except Exception as e:
+        print(f"이미지 해시 계산 오류: {e}")
+        return None
+    finally:
+        image_stream.seek(0)
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+class PerceptualHashCache:
+    """지각 해시(perceptual hash)로 찾는 얼굴 분석 결과 캐시
+
+    해시가 정확히 같지 않아도 해밍 거리가 threshold 이하이면 같은 사진으로 보고 적중 처리합니다.
+    항목 수가 적으므로(최대 max_entries) 조회는 단순 선형 탐색으로 충분합니다.
+    """
+
+    def __init__(self, max_entries=2048, ttl_seconds=86400, threshold=5):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self._data = OrderedDict()  # hash -> (만료 시각, 값)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, image_hash):
+        if image_hash is None:
+            return None
+        now = time.time()
+        with self._lock:
+            best_key, best_distance = None, None
+            for key, (expires_at, _) in list(self._data.items()):
+                if expires_at <= now:
+                    del self._data[key]
+                    continue
+                distance = (key ^ image_hash).bit_count()
+                if distance <= self.threshold and (best_distance is None or distance < best_distance):
+                    best_key, best_distance = key, distance
+                    if distance == 0:
+                        break
+            if best_key is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(best_key)
+            self.hits += 1
+            return self._data[best_key][1]
+
+    def set(self, image_hash, value):
+        if image_hash is None:
+            return
+        with self._lock:
+            self._data[image_hash] = (time.time() + self._ttl_seconds, value)
+            self._data.move_to_end(image_hash)
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'max_entries': self._max_entries,
+                'hash_threshold': self.threshold,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else None,
+            }
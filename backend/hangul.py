@@ -0,0 +1,57 @@
+# backend/hangul.py
+
+import unicodedata
+
+# 완성형 한글 음절 범위 (가 ~ 힣)
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_LAST = 0xD7A3
+_JUNGSEONG_COUNT = 21
+_JONGSEONG_COUNT = 28
+
+# 초성/중성/종성 (호환용 자모, 사용자가 직접 입력하는 'ㄱ', 'ㅏ'와 같은 문자)
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSEONG = ('', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ',
+             'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ')
+
+# 겹모음/겹받침은 구성 자모로 풀어서 비교 (예: 'ㅘ' -> 'ㅗㅏ', 'ㄺ' -> 'ㄹㄱ')
+_COMPOUND_JAMO = {
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+}
+
+
+def is_syllable(char):
+    return _SYLLABLE_BASE <= ord(char) <= _SYLLABLE_LAST
+
+
+def split_syllable(char):
+    """한글 음절 하나를 (초성, 중성, 종성) 호환용 자모로 나눕니다. (종성이 없으면 '')"""
+    index = ord(char) - _SYLLABLE_BASE
+    cho, rest = divmod(index, _JUNGSEONG_COUNT * _JONGSEONG_COUNT)
+    jung, jong = divmod(rest, _JONGSEONG_COUNT)
+    return CHOSEONG[cho], JUNGSEONG[jung], JONGSEONG[jong]
+
+
+def decompose(text):
+    """문자열의 한글 음절을 자모 단위로 풀어 씁니다. (한글 외 문자는 그대로)
+
+    '단발컷' -> 'ㄷㅏㄴㅂㅏㄹㅋㅓㅅ' 처럼 풀어 두면 받침 하나가 틀리거나 입력 중인 음절도
+    대부분의 자모가 겹치므로 트라이그램 비교에서 가까운 철자로 잡힙니다.
+    """
+    text = unicodedata.normalize('NFC', text)
+    parts = []
+    for char in text:
+        if is_syllable(char):
+            for jamo in split_syllable(char):
+                parts.append(_COMPOUND_JAMO.get(jamo, jamo))
+        else:
+            parts.append(_COMPOUND_JAMO.get(char, char))
+    return ''.join(parts)
+
+
+def choseong(text):
+    """문자열의 한글 음절을 초성만 남긴 문자열로 바꿉니다. ('포니테일' -> 'ㅍㄴㅌㅇ', 한글 외 문자는 그대로)"""
+    text = unicodedata.normalize('NFC', text)
+    return ''.join(split_syllable(char)[0] if is_syllable(char) else char for char in text)
@@ -0,0 +1,49 @@
+# backend/http_cache.py
+
+import functools
+import os
+from datetime import datetime, timezone
+from flask import request, make_response
+
+# 카탈로그 응답을 브라우저/CDN이 재검증 없이 사용할 수 있는 시간(초)
+CATALOG_CACHE_MAX_AGE = int(os.getenv('CATALOG_CACHE_MAX_AGE', '60'))
+
+
+def catalog_conditional(catalog_index, max_age=CATALOG_CACHE_MAX_AGE):
+    """카탈로그 버전 기반 ETag/Last-Modified/Cache-Control을 붙이고 조건부 GET에 304로 응답하는 데코레이터
+
+    응답 내용이 카탈로그 내용과 요청 파라미터로만 정해지는 GET 라우트에 사용합니다.
+    (같은 URL이면 카탈로그 버전이 같을 때 응답도 같음)
+    If-None-Match / If-Modified-Since가 현재 카탈로그와 일치하면 뷰 함수를 실행하지 않고 바로 304를 반환합니다.
+    카탈로그를 아직 읽지 못했으면(DB 직접 조회 경로) 캐시 헤더 없이 그대로 응답합니다.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not catalog_index.ensure_fresh():
+                return view(*args, **kwargs)
+            etag = catalog_index.version
+            last_modified = datetime.fromtimestamp(int(catalog_index.changed_at), tz=timezone.utc)
+
+            if _not_modified(etag, last_modified):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response # 오류 응답은 캐시하지 않음
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age
+            return response
+        return wrapper
+    return decorator
+
+
+def _not_modified(etag, last_modified):
+    # If-None-Match가 있으면 If-Modified-Since보다 우선 (RFC 9110)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since:
+        return last_modified <= request.if_modified_since
+    return False
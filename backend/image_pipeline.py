@@ -0,0 +1,113 @@
+# backend/image_pipeline.py
+
+import io
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageOps
+
+from image_probe import ValidatedImage
+
+# AILab 업로드 기준 최대 가로/세로 크기와 재인코딩 JPEG 품질
+UPSTREAM_MAX_DIMENSION = int(os.getenv('UPSTREAM_MAX_DIMENSION', '2000'))
+NORMALIZE_JPEG_QUALITY = int(os.getenv('NORMALIZE_JPEG_QUALITY', '88'))
+IMAGE_PIPELINE_WORKERS = int(os.getenv('IMAGE_PIPELINE_WORKERS', str(os.cpu_count() or 2)))
+
+_EXIF_ORIENTATION_TAG = 0x0112
+# 무손실로 제거할 JPEG 메타데이터 세그먼트 (APP1: EXIF/XMP, APP13: IPTC, COM: 주석)
+# APP0(JFIF), APP2(ICC 색 프로파일), APP14(Adobe 색 변환)는 디코딩에 영향이 있어 유지
+_STRIPPED_JPEG_MARKERS = {0xE1, 0xED, 0xFE}
+
+# Pillow의 디코딩/리사이즈는 GIL을 놓고 실행되므로, 전용 스레드 풀에서 CPU 사용량을 제한하며 처리
+_executor = ThreadPoolExecutor(max_workers=IMAGE_PIPELINE_WORKERS, thread_name_prefix='image-pipeline')
+
+
+def normalize_image(upload, max_dimension=UPSTREAM_MAX_DIMENSION, quality=NORMALIZE_JPEG_QUALITY):
+    """업로드 이미지를 AILab 업로드용으로 정규화합니다. (이미지 처리 스레드 풀에서 실행)
+
+    - 기준 크기를 넘으면 거절하지 않고 비율을 유지해 축소 (JPEG는 draft 모드로 축소 디코딩)
+    - BMP/PNG는 품질을 조절한 JPEG로 재인코딩해 전송량을 줄임
+    - EXIF 등 메타데이터 제거 (회전 정보는 픽셀에 반영)
+    축소/재인코딩이 필요 없는 JPEG는 메타데이터 세그먼트만 잘라내고 그대로 사용합니다.
+    """
+    return _executor.submit(_normalize, upload, max_dimension, quality).result()
+
+
+def _normalize(upload, max_dimension, quality):
+    upload.stream.seek(0)
+    img = Image.open(upload.stream)
+    orientation = img.getexif().get(_EXIF_ORIENTATION_TAG, 1)
+    needs_resize = upload.width > max_dimension or upload.height > max_dimension
+
+    if upload.format == 'jpeg' and not needs_resize and orientation == 1:
+        with upload.stream.getbuffer() as data:
+            stripped = strip_jpeg_metadata(data)
+        upload.stream.seek(0)
+        if stripped is None:
+            return upload
+        return ValidatedImage(io.BytesIO(stripped), 'jpeg', upload.width, upload.height, upload.filename)
+
+    if needs_resize:
+        # JPEG는 1/2, 1/4, 1/8 배율로 바로 디코딩 (목표 크기보다 작아지지 않는 선에서)
+        scale = max_dimension / max(upload.width, upload.height)
+        img.draft('RGB', (int(upload.width * scale), int(upload.height * scale)))
+
+    img = ImageOps.exif_transpose(img)
+    if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+        # 투명 배경은 흰색으로 합성 (JPEG는 알파 채널 미지원)
+        img = img.convert('RGBA')
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel('A'))
+        img = background
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+    if needs_resize:
+        img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+
+    output = io.BytesIO()
+    img.save(output, 'JPEG', quality=quality, optimize=True) # exif 인자를 넘기지 않으므로 메타데이터 없음
+    output.seek(0)
+    upload.stream.seek(0)
+
+    base_name = upload.filename.rsplit('.', 1)[0] if upload.filename and '.' in upload.filename else (upload.filename or 'image')
+    print(f"이미지 정규화: {upload.format} {upload.width}x{upload.height} ({upload.size} bytes) "
+          f"-> jpeg {img.width}x{img.height} ({output.getbuffer().nbytes} bytes)")
+    return ValidatedImage(output, 'jpeg', img.width, img.height, f"{base_name}.jpg")
+
+
+def strip_jpeg_metadata(data):
+    """JPEG 데이터에서 EXIF/XMP/IPTC/주석 세그먼트를 무손실로 제거합니다.
+
+    제거할 세그먼트가 없으면 None을 반환합니다. (호출자는 원본을 그대로 사용)
+    """
+    kept = [data[:2]] # SOI
+    offset = 2
+    removed = False
+    length = len(data)
+    while offset + 4 <= length:
+        if data[offset] != 0xFF:
+            return None # 예상치 못한 구조: 건드리지 않음
+        marker = data[offset + 1]
+        if marker == 0xDA: # SOS 이후는 압축 데이터이므로 그대로 복사
+            kept.append(data[offset:])
+            break
+        if marker == 0xFF: # 채움 바이트
+            offset += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            kept.append(data[offset:offset + 2])
+            offset += 2
+            continue
+        segment_length = struct.unpack('>H', data[offset + 2:offset + 4])[0]
+        segment_end = offset + 2 + segment_length
+        if marker in _STRIPPED_JPEG_MARKERS:
+            removed = True
+        else:
+            kept.append(data[offset:segment_end])
+        offset = segment_end
+    else:
+        return None
+
+    if not removed:
+        return None
+    return b''.join(kept)
@@ -0,0 +1,175 @@
+# backend/image_probe.py
+
+import io
+import os
+import struct
+
+# 헤더를 읽을 때 한 번에 읽는 크기
+PROBE_CHUNK_SIZE = 64 * 1024
+# 압축 폭탄(decompression bomb) 방지용 최대 픽셀 수 (기본 4천만 픽셀)
+MAX_IMAGE_PIXELS = int(os.getenv('MAX_IMAGE_PIXELS', str(40_000_000)))
+
+# 매직 바이트 -> (포맷 이름, MIME 타입)
+_SIGNATURES = [
+    (b'\xff\xd8\xff', 'jpeg', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'png', 'image/png'),
+    (b'BM', 'bmp', 'image/bmp'),
+]
+_MIMETYPES = {fmt: mimetype for _, fmt, mimetype in _SIGNATURES}
+
+# 크기 정보를 담은 JPEG SOF 마커 (C4: DHT, C8: JPG 확장, CC: DAC 제외)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+class ImageRejected(Exception):
+    """업로드 이미지가 검증을 통과하지 못했을 때 발생 (메시지는 사용자에게 그대로 전달)"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class ValidatedImage:
+    """검증을 통과한 업로드 이미지
+
+    stream은 Werkzeug가 받아 둔 업로드(FileStorage)를 한 번 복사한 BytesIO이며, 이후 해시 계산(getbuffer),
+    Pillow 디코딩, AILab 업로드는 이 버퍼를 더 복사하지 않고 함께 사용합니다. (사용 전 seek(0))
+    """
+
+    def __init__(self, stream, image_format, width, height, filename):
+        self.stream = stream
+        self.format = image_format
+        self.width = width
+        self.height = height
+        self.filename = filename
+        self.mimetype = _MIMETYPES[image_format]
+
+    @property
+    def size(self):
+        return self.stream.getbuffer().nbytes
+
+    def clone(self):
+        """같은 내용을 독립된 읽기 위치로 읽는 복사본 (여러 작업 스레드가 동시에 업로드할 때 사용)"""
+        return ValidatedImage(io.BytesIO(self.stream.getvalue()), self.format, self.width, self.height, self.filename)
+
+
+def sniff_format(head):
+    """파일 앞부분의 매직 바이트로 이미지 포맷을 판별합니다. (모르면 None)"""
+    for signature, image_format, _ in _SIGNATURES:
+        if head[:len(signature)] == signature:
+            return image_format
+    return None
+
+
+def probe_dimensions(head, image_format):
+    """이미지 헤더만 파싱해 (width, height)를 구합니다.
+
+    head에 헤더 전체가 아직 없으면 None을 반환하므로, 더 읽은 뒤 다시 호출하면 됩니다.
+    헤더가 깨져 있으면 ImageRejected를 발생시킵니다.
+    """
+    if image_format == 'png':
+        # 시그니처(8) + IHDR 길이(4) + 'IHDR'(4) + width(4) + height(4)
+        if len(head) < 24:
+            return None
+        if head[12:16] != b'IHDR':
+            raise ImageRejected("손상된 PNG 이미지입니다.")
+        return struct.unpack('>II', head[16:24])
+
+    if image_format == 'bmp':
+        if len(head) < 26:
+            return None
+        dib_header_size = struct.unpack('<I', head[14:18])[0]
+        if dib_header_size == 12: # OS/2 BITMAPCOREHEADER
+            width, height = struct.unpack('<HH', head[18:22])
+        else:
+            width, height = struct.unpack('<ii', head[18:26])
+        return abs(width), abs(height)
+
+    if image_format == 'jpeg':
+        return _probe_jpeg(head)
+
+    return None
+
+
+def _probe_jpeg(head):
+    # SOI(FFD8) 다음부터 마커 세그먼트를 건너뛰며 SOF 마커를 찾음
+    offset = 2
+    length = len(head)
+    while offset + 4 <= length:
+        if head[offset] != 0xFF:
+            raise ImageRejected("손상된 JPEG 이미지입니다.")
+        marker = head[offset + 1]
+        if marker == 0xFF: # 채움 바이트
+            offset += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9: # 길이 없는 단독 마커
+            offset += 2
+            continue
+        segment_length = struct.unpack('>H', head[offset + 2:offset + 4])[0]
+        if marker in _JPEG_SOF_MARKERS:
+            if offset + 9 > length:
+                return None
+            height, width = struct.unpack('>HH', head[offset + 5:offset + 9])
+            return width, height
+        offset += 2 + segment_length
+    return None
+
+
+def read_validated_image(file_storage, max_bytes, allowed_formats, max_dimension=None,
+                         max_pixels=MAX_IMAGE_PIXELS):
+    """업로드 파일을 조금씩 읽으면서 검증하고 ValidatedImage를 반환합니다.
+
+    - 첫 청크의 매직 바이트로 실제 포맷을 판별 (확장자/클라이언트 MIME 타입은 믿지 않음)
+    - 헤더만 파싱해 해상도를 구하고, 너무 크거나 폭탄 의심 이미지는 디코딩 전에 거절
+    - max_bytes를 넘는 순간 버퍼 복사를 멈추고 거절
+    이 함수가 호출될 때는 Werkzeug가 multipart 본문을 이미 끝까지 받아 FileStorage(메모리/임시 파일)에
+    담아 둔 상태이므로, 여기서의 거절은 네트워크 수신이 아니라 버퍼 복사와 디코딩을 줄일 뿐입니다.
+    본문을 다 받기 전에 거절하는 것은 MAX_CONTENT_LENGTH(413)뿐입니다.
+    검증에 실패하면 ImageRejected를 발생시킵니다.
+    """
+    buffer = io.BytesIO()
+    image_format = None
+    dimensions = None
+    total = 0
+
+    while True:
+        chunk = file_storage.stream.read(PROBE_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_bytes:
+            raise ImageRejected(f"이미지 파일 크기는 {max_bytes // (1024 * 1024)}MB를 초과할 수 없습니다.")
+        buffer.write(chunk)
+
+        if dimensions is not None:
+            continue
+        # getbuffer()는 복사 없는 뷰이므로, 다음 write 전에 반드시 해제
+        with buffer.getbuffer() as head:
+            if image_format is None:
+                image_format = sniff_format(head)
+                if image_format is None or image_format not in allowed_formats:
+                    allowed = ', '.join(fmt.upper() for fmt in sorted(allowed_formats))
+                    raise ImageRejected(f"허용되지 않는 파일 형식입니다 ({allowed}).")
+            dimensions = probe_dimensions(head, image_format)
+        if dimensions is not None:
+            _check_dimensions(dimensions, max_dimension, max_pixels)
+
+    if total == 0:
+        raise ImageRejected("빈 이미지 파일입니다.")
+    if dimensions is None:
+        raise ImageRejected("이미지 크기 정보를 읽을 수 없습니다.")
+
+    buffer.seek(0)
+    return ValidatedImage(buffer, image_format, dimensions[0], dimensions[1], file_storage.filename)
+
+
+def _check_dimensions(dimensions, max_dimension, max_pixels):
+    width, height = dimensions
+    print(f"이미지 해상도: {width}x{height}")
+    if width <= 0 or height <= 0:
+        raise ImageRejected("이미지 크기 정보가 올바르지 않습니다.")
+    if width * height > max_pixels:
+        raise ImageRejected("이미지 해상도가 너무 큽니다.")
+    if max_dimension and (width > max_dimension or height > max_dimension):
+        raise ImageRejected(f"이미지 해상도는 {max_dimension}x{max_dimension} 픽셀을 초과할 수 없습니다.")
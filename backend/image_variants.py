@@ -0,0 +1,115 @@
+# backend/image_variants.py
+
+import hashlib
+import io
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageOps
+
+# --- 카탈로그 이미지 반응형 변형 설정 ---
+CATALOG_VARIANT_DIR = os.getenv('CATALOG_VARIANT_DIR',
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'variants'))
+# 만들 가로 크기(px) - 목록 썸네일(100~150px)의 1x/2x와 상세 보기용 (원본보다 큰 크기는 원본 크기로 대체)
+CATALOG_VARIANT_WIDTHS = tuple(int(width) for width in os.getenv('CATALOG_VARIANT_WIDTHS', '160,320,640').split(','))
+CATALOG_VARIANT_WEBP_QUALITY = int(os.getenv('CATALOG_VARIANT_WEBP_QUALITY', '80'))
+CATALOG_VARIANT_JPEG_QUALITY = int(os.getenv('CATALOG_VARIANT_JPEG_QUALITY', '82'))
+CATALOG_VARIANT_WORKERS = int(os.getenv('CATALOG_VARIANT_WORKERS', str(os.cpu_count() or 2)))
+# 변형 파일을 서빙하는 URL 경로 (app.py의 send_catalog_image 라우트)
+CATALOG_IMAGE_URL_PREFIX = '/catalog-images/'
+
+# variant map 키 -> (Pillow 형식, 확장자, 저장 옵션)
+_FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': CATALOG_VARIANT_WEBP_QUALITY, 'method': 6}),
+    'jpeg': ('JPEG', 'jpg', {'quality': CATALOG_VARIANT_JPEG_QUALITY, 'optimize': True, 'progressive': True}),
+}
+_FILENAME_PATTERN = re.compile(r'^[\w-]+\.[0-9a-f]{12}\.\d+w\.(webp|jpg)$')
+
+
+def is_variant_filename(filename):
+    """build_variants가 만드는 파일명 형식인지 확인합니다. (경로 조작 방지)"""
+    return bool(_FILENAME_PATTERN.match(filename))
+
+
+def file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def variants_present(variants, output_dir=CATALOG_VARIANT_DIR):
+    """variant map의 파일이 모두 디스크에 있는지 확인합니다."""
+    for key in _FORMATS:
+        srcset = (variants or {}).get(key)
+        if not srcset:
+            return False
+        for entry in srcset.split(','):
+            url = entry.strip().split(' ')[0]
+            if not os.path.exists(os.path.join(output_dir, url[len(CATALOG_IMAGE_URL_PREFIX):])):
+                return False
+    return True
+
+
+def build_variants(source_path, output_dir=CATALOG_VARIANT_DIR, widths=CATALOG_VARIANT_WIDTHS):
+    """이미지 하나의 반응형 WebP/JPEG 변형을 만들고 variant map을 반환합니다.
+
+    파일명에 변형 내용 해시를 넣으므로(<이름>.<해시>.<가로>w.<확장자>) 내용이 바뀌면 URL도 바뀌어
+    브라우저/CDN이 오래 캐시해도 안전합니다.
+    반환 값: {"source_sha256", "width", "height", "webp": srcset 문자열, "jpeg": srcset 문자열}
+    """
+    with open(source_path, 'rb') as f:
+        data = f.read()
+    img = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    stem = re.sub(r'[^\w-]', '_', os.path.splitext(os.path.basename(source_path))[0])
+    sizes = sorted({min(width, img.width) for width in widths})
+    resized = {width: img if width == img.width else
+               img.resize((width, max(1, round(img.height * width / img.width))), Image.Resampling.LANCZOS)
+               for width in sizes}
+
+    variants = {'source_sha256': hashlib.sha256(data).hexdigest(), 'width': img.width, 'height': img.height}
+    for key, (pil_format, extension, options) in _FORMATS.items():
+        entries = []
+        for width in sizes:
+            output = io.BytesIO()
+            resized[width].save(output, pil_format, **options)
+            encoded = output.getvalue()
+            filename = f"{stem}.{hashlib.sha256(encoded).hexdigest()[:12]}.{width}w.{extension}"
+            _write_file(output_dir, filename, encoded)
+            entries.append(f"{CATALOG_IMAGE_URL_PREFIX}{filename} {width}w")
+        variants[key] = ', '.join(entries)
+    return variants
+
+
+def build_catalog_variants(sources, output_dir=CATALOG_VARIANT_DIR, max_workers=CATALOG_VARIANT_WORKERS):
+    """{키: 원본 경로}의 변형을 병렬로 만들고 {키: variant map}을 반환합니다. (실패한 항목은 제외)
+
+    Pillow의 디코딩/리사이즈/인코딩은 GIL을 놓고 실행되므로 스레드 풀로도 코어를 나눠 씁니다.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='image-variants') as executor:
+        futures = {key: executor.submit(build_variants, path, output_dir) for key, path in sources.items()}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                print(f"이미지 변형 생성 실패 ({sources[key]}): {e}")
+    return results
+
+
+def _write_file(output_dir, filename, data):
+    path = os.path.join(output_dir, filename)
+    if os.path.exists(path):
+        return # 파일명이 내용 해시이므로 이미 있으면 같은 내용
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, prefix='.tmp-')
+    try:
+        os.fchmod(fd, 0o644)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
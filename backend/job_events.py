@@ -0,0 +1,169 @@
+# backend/job_events.py
+
+import asyncio
+import os
+import queue
+import re
+
+from transform_jobs import JOB_SUCCEEDED, JOB_FAILED
+
+# 프록시가 유휴 연결을 끊지 않도록 보내는 주석 간격(초)
+SSE_KEEPALIVE_SECONDS = int(os.getenv('SSE_KEEPALIVE_SECONDS', '15'))
+
+SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no' # 프록시(nginx 등)가 이벤트를 모아서 보내지 않도록
+}
+
+_EVENTS_PATH = re.compile(r'^/api/transform-jobs/([^/]+)/events$')
+
+
+class JobEventFeed:
+    """변환 작업 상태/진행 이벤트를 Server-Sent Events 문자열로 만드는 도우미
+
+    - event: status   -> 작업 상태가 바뀔 때 (끝나면 result_image_url 또는 error 포함 후 스트림 종료)
+    - event: progress -> 폴러가 AILab 작업 상태를 확인할 때마다 (stage: waiting/uploading/submitted/queued/processing/storing)
+    status_body(job)는 상태 조회 API와 같은 응답 본문을, dumps는 JSON 직렬화 함수를 넘깁니다.
+    """
+
+    def __init__(self, jobs, status_body, dumps, keepalive_seconds=SSE_KEEPALIVE_SECONDS):
+        self.jobs = jobs
+        self._status_body = status_body
+        self._dumps = dumps
+        self.keepalive_seconds = keepalive_seconds
+
+    def opening(self, job):
+        """구독 직후 보낼 SSE 문자열 목록과, 작업이 이미 끝나 스트림을 닫아야 하는지 여부"""
+        texts = ["retry: 3000\n\n", self._event('status', self._status_body(job))] # 연결이 끊기면 3초 뒤 재연결
+        if job['status'] in (JOB_SUCCEEDED, JOB_FAILED):
+            return texts, True
+        if job['progress']:
+            # 구독 전에 기록된 진행 단계 (슬롯을 기다리는 작업의 'waiting' 등)
+            texts.append(self._progress(job))
+        return texts, False
+
+    def render(self, event):
+        """구독 큐에서 꺼낸 이벤트 하나의 SSE 문자열과, 스트림을 닫아야 하는지 여부"""
+        job = event['job']
+        if event['type'] == 'progress':
+            return self._progress(job), False
+        return self._event('status', self._status_body(job)), job['status'] in (JOB_SUCCEEDED, JOB_FAILED)
+
+    def stream(self, job_id):
+        """WSGI 응답용 동기 제너레이터 (작업이 없으면 None)
+
+        이벤트를 기다리는 동안 응답을 보내는 워커 스레드가 함께 대기하므로, 열린 스트림마다 스레드 하나를 차지합니다.
+        asgi.py로 실행하면 JobEventsASGI가 이 경로를 이벤트 루프에서 처리합니다.
+        """
+        subscription = self.jobs.subscribe(job_id)
+        if subscription is None:
+            return None
+        job, events = subscription
+
+        def generate():
+            try:
+                texts, finished = self.opening(job)
+                yield from texts
+                while not finished:
+                    try:
+                        event = events.get(timeout=self.keepalive_seconds)
+                    except queue.Empty:
+                        yield ": keepalive\n\n"
+                        continue
+                    text, finished = self.render(event)
+                    yield text
+            finally:
+                self.jobs.unsubscribe(job_id, events)
+
+        return generate()
+
+    def _progress(self, job):
+        return self._event('progress', dict(job['progress'] or {}, job_id=job['job_id'], status=job['status']))
+
+    def _event(self, event_type, data):
+        return f"event: {event_type}\ndata: {self._dumps(data)}\n\n"
+
+
+class JobEventsASGI:
+    """GET /api/transform-jobs/<job_id>/events를 이벤트 루프에서 직접 보내는 ASGI 앱
+
+    구독자는 작업별 asyncio.Queue를 await하므로 대기 중인 연결은 스레드를 차지하지 않습니다.
+    (작업 스레드/AsyncRuntime이 call_soon_threadsafe로 이벤트를 넣음)
+    그 밖의 요청과 없는 작업 ID는 fallback(Flask 앱을 감싼 ASGI 앱)으로 넘깁니다.
+    allowed_origins는 Flask-CORS와 같은 허용 출처 목록입니다.
+    """
+
+    def __init__(self, fallback, feed, allowed_origins=()):
+        self._fallback = fallback
+        self._feed = feed
+        self._allowed_origins = set(allowed_origins)
+        # 통계
+        self.open_streams = 0
+        self.peak_open_streams = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        match = _EVENTS_PATH.match(scope.get('path', '')) if scope['type'] == 'http' else None
+        if match is None or scope['method'] != 'GET':
+            return await self._fallback(scope, receive, send)
+        job_id = match.group(1)
+        subscription = self._feed.jobs.subscribe(job_id, loop=asyncio.get_running_loop())
+        if subscription is None:
+            return await self._fallback(scope, receive, send) # 404 응답은 Flask 라우트와 같게
+        job, events = subscription
+        self.open_streams += 1
+        self.peak_open_streams = max(self.peak_open_streams, self.open_streams)
+        disconnected = asyncio.ensure_future(self._wait_disconnect(receive))
+        try:
+            await send({'type': 'http.response.start', 'status': 200, 'headers': self._headers(scope)})
+            texts, finished = self._feed.opening(job)
+            await self._send_text(send, ''.join(texts))
+            while not finished:
+                getter = asyncio.ensure_future(events.get())
+                done, _ = await asyncio.wait({getter, disconnected}, timeout=self._feed.keepalive_seconds,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if getter not in done:
+                    getter.cancel()
+                    if disconnected in done:
+                        return
+                    await self._send_text(send, ": keepalive\n\n")
+                    continue
+                text, finished = self._feed.render(getter.result())
+                await self._send_text(send, text)
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            disconnected.cancel()
+            self._feed.jobs.unsubscribe(job_id, events)
+            self.open_streams -= 1
+
+    def _headers(self, scope):
+        headers = [(b'content-type', b'text/event-stream; charset=utf-8')]
+        headers += [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in SSE_HEADERS.items()]
+        origin = dict(scope.get('headers') or ()).get(b'origin', b'').decode('latin-1')
+        if origin in self._allowed_origins:
+            headers += [(b'access-control-allow-origin', origin.encode('latin-1')),
+                        (b'access-control-allow-credentials', b'true'),
+                        (b'vary', b'Origin')]
+        return headers
+
+    @staticmethod
+    async def _send_text(send, text):
+        await send({'type': 'http.response.body', 'body': text.encode('utf-8'), 'more_body': True})
+
+    @staticmethod
+    async def _wait_disconnect(receive):
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+
+    @staticmethod
+    async def _lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
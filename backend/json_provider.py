@@ -0,0 +1,62 @@
+# backend/json_provider.py
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson # 선택 의존성: 설치되어 있으면 표준 json 대신 사용
+except ImportError:
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """orjson으로 직렬화하는 Flask JSON provider (orjson이 없으면 기본 provider와 동일하게 동작)
+
+    - 한국어 설명 등 비ASCII 문자를 \\uXXXX로 이스케이프하지 않고 UTF-8 그대로 출력 (응답 크기 감소)
+    - 키 정렬(sort_keys)은 기본 provider와 같게 유지해 같은 데이터는 항상 같은 바이트로 직렬화
+    - orjson이 직접 처리하지 못하는 값(datetime, Decimal 등)은 기본 provider의 default()로 변환해
+      기존 jsonify와 같은 형식을 유지
+    jsonify(response)가 항상 넘기는 separators=(",", ":")(압축 출력)와 indent=2(디버그 모드)는 orjson 옵션으로
+    바꿔 처리하고, 그 밖의 인자를 넘기면 표준 json으로 처리합니다.
+    """
+
+    def dumps(self, obj, **kwargs):
+        option = self._orjson_option(kwargs)
+        if option is None:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        """jsonify 응답: orjson이 만든 UTF-8 bytes를 str로 되돌리지 않고 그대로 본문으로 사용"""
+        dump_args = {'indent': 2} if (self.compact is None and self._app.debug) or self.compact is False \
+            else {'separators': (',', ':')}
+        option = self._orjson_option(dump_args)
+        if option is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=option | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def _orjson_option(self, kwargs):
+        """dumps 인자에 해당하는 orjson 옵션 (orjson이 없거나 표현할 수 없는 인자면 None)"""
+        if orjson is None:
+            return None
+        kwargs = dict(kwargs)
+        indent = kwargs.pop('indent', None)
+        separators = kwargs.pop('separators', None)
+        if kwargs or indent not in (None, 2) or separators not in (None, (',', ':')):
+            return None
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    @property
+    def backend(self):
+        return 'orjson' if orjson is not None else 'json'
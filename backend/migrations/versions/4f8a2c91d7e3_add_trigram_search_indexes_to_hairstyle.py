@@ -0,0 +1,37 @@
+"""Add pg_trgm GIN indexes for hairstyle search
+
+Revision ID: 4f8a2c91d7e3
+Revises: 02732c845b08
+Create Date: 2026-10-18 11:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f8a2c91d7e3'
+down_revision = '02732c845b08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 트라이그램 인덱스/연산자(%, similarity)는 PostgreSQL pg_trgm 확장에서만 제공
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.batch_alter_table('hairstyle', schema=None) as batch_op:
+        batch_op.create_index('idx_gin_hairstyle_name_trgm', ['name'], unique=False,
+                              postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+        batch_op.create_index('idx_gin_hairstyle_description_trgm', ['description'], unique=False,
+                              postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'})
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.batch_alter_table('hairstyle', schema=None) as batch_op:
+        batch_op.drop_index('idx_gin_hairstyle_description_trgm', postgresql_using='gin')
+        batch_op.drop_index('idx_gin_hairstyle_name_trgm', postgresql_using='gin')
+    # pg_trgm 확장은 다른 곳에서 사용할 수 있으므로 제거하지 않음
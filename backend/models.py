@@ -14,10 +14,30 @@ class Hairstyle(db.Model):
     similar_styles_description = db.Column(db.Text, nullable=True)
     brand_price = db.Column(db.Integer, nullable=True)
     normal_price = db.Column(db.Integer, nullable=True)
+    # 반응형 이미지 변형 (flask build-image-variants로 생성): {"source_sha256", "width", "height", "webp": srcset, "jpeg": srcset}
+    image_variants = db.Column(db.JSON, nullable=True)
+
+    # 검색용 GIN 트라이그램 인덱스 (PostgreSQL pg_trgm, 다른 DB에서는 일반 인덱스로 생성됨)
+    # 모델에 선언해 두어야 alembic autogenerate가 인덱스를 지우는 마이그레이션을 만들지 않음
+    __table_args__ = (
+        db.Index('idx_gin_hairstyle_name_trgm', 'name',
+                 postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        db.Index('idx_gin_hairstyle_description_trgm', 'description',
+                 postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+    )
 
     def __repr__(self):
         return f'<Hairstyle {self.id}: {self.name}>'
 
+class CatalogVersion(db.Model):
+    # 헤어스타일 카탈로그 변경 표시 (id=1 한 행) - 카탈로그를 바꾸는 작업이 version을 올리면
+    # 모든 서버 프로세스의 카탈로그 인덱스가 CATALOG_VERSION_CHECK_SECONDS 안에 다시 읽음 (catalog.mark_catalog_changed)
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<CatalogVersion {self.version}>'
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True) # 사용자 고유 ID (자동 증가)
     google_id = db.Column(db.String(200), unique=True, nullable=False) # Google 사용자의 고유 ID
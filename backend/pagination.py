@@ -0,0 +1,36 @@
+# backend/pagination.py
+
+import base64
+import json
+
+# 검색 점수의 소수 자릿수 - 점수는 이 자릿수로 반올림해 정렬/비교하고 커서에도 그대로 담음
+# (PostgreSQL similarity()는 real(float4)이라, 반올림하지 않으면 JSON(float8)을 거친 커서 점수가 행 점수와 같아지지 않음)
+SCORE_DIGITS = 6
+
+
+def encode_cursor(score, name):
+    """목록의 마지막 항목 (점수, 이름)을 다음 페이지 요청용 불투명 커서 문자열로 변환
+
+    이름순 목록처럼 점수가 없는 경우 score는 None입니다. (DB 순위 검색의 Decimal 점수는 float로 변환)
+    """
+    if score is not None:
+        score = round(float(score), SCORE_DIGITS)
+    raw = json.dumps([score, name], ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(value):
+    """encode_cursor로 만든 커서를 (점수, 이름)으로 되돌립니다. (없으면 None)
+
+    형식이 잘못된 커서면 ValueError를 발생시킵니다.
+    """
+    if not value:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+        score, name = json.loads(raw.decode('utf-8'))
+    except (ValueError, TypeError):
+        raise ValueError("잘못된 cursor 값입니다.")
+    if not isinstance(name, str) or not (score is None or isinstance(score, (int, float))) or isinstance(score, bool):
+        raise ValueError("잘못된 cursor 값입니다.")
+    return score, name
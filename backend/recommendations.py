@@ -0,0 +1,97 @@
+# backend/recommendations.py
+
+import threading
+
+# 성별 코드가 0/1이 아닐 때 사용하는 키 (추천은 남성(0) 목록, 표시는 "알 수 없음")
+OTHER_GENDER = 'other'
+
+
+class RecommendationResponses:
+    """(얼굴형, 성별) 조합별 추천 응답을 미리 만들어 둔 JSON 본문 테이블
+
+    가능한 조합이 얼마 안 되므로 추천 목록/이유/한국어 이름을 매번 조립하지 않고,
+    시작 시와 카탈로그가 바뀔 때 직렬화된 응답 본문(bytes)을 만들어 둡니다.
+    analyze_face는 AILab 결과를 받은 뒤 dict 조회 한 번으로 응답을 보낼 수 있습니다.
+    """
+
+    def __init__(self, recommendations_db, name_map, face_shape_kr_map, gender_kr_map, catalog_index, dumps):
+        self._recommendations_db = recommendations_db
+        self._name_map = name_map
+        self._face_shape_kr_map = face_shape_kr_map
+        self._gender_kr_map = gender_kr_map
+        self._catalog_index = catalog_index
+        self._dumps = dumps  # dict -> JSON 문자열 (app.json.dumps)
+        self._lock = threading.Lock()
+        self._bodies = {}
+        self._version = None
+
+    def rebuild(self, catalog_index=None):
+        """모든 조합의 응답 본문을 다시 만듭니다. (카탈로그 변경 리스너로도 사용)"""
+        try:
+            all_names = [self._name_map.get(value, value)
+                         for shape_data in self._recommendations_db.values()
+                         for gender_data in shape_data.values()
+                         for value in gender_data.get("styles", [])]
+            images = self._catalog_index.images_for(all_names)
+        except Exception as db_e:
+            print(f"Error querying Hairstyle DB: {db_e}")
+            images = {} # DB 조회 실패 시, 이름만이라도 보내주기 (이미지는 placeholder)
+
+        bodies = {}
+        for face_shape_type in self._recommendations_db:
+            for gender_key in (0, 1, OTHER_GENDER):
+                result = self._build(face_shape_type, gender_key, images)
+                bodies[(face_shape_type, gender_key)] = self._dumps(result).encode('utf-8')
+
+        with self._lock:
+            self._bodies = bodies
+            self._version = self._catalog_index.version
+        print(f"추천 응답 {len(bodies)}개 생성 완료 (catalog version: {self._version})")
+
+    def get(self, face_shape_type, gender_type):
+        """분석 결과에 해당하는 JSON 응답 본문(bytes)을 반환합니다."""
+        self._catalog_index.ensure_fresh()
+        if not self._bodies or self._version is None or self._version != self._catalog_index.version:
+            # 카탈로그를 아직 읽지 못했으면 매번 다시 만듦 (DB 조회로 대체)
+            self.rebuild()
+
+        shape_key = face_shape_type if self._is_known(face_shape_type, self._recommendations_db) else "unknown"
+        gender_key = gender_type if gender_type in (0, 1) else OTHER_GENDER
+        return self._bodies[(shape_key, gender_key)]
+
+    @staticmethod
+    def _is_known(key, mapping):
+        try:
+            return key in mapping
+        except TypeError: # dict/list 등 해시 불가능한 값
+            return False
+
+    def _build(self, face_shape_type, gender_key, images):
+        # DB(딕셔너리)에서 추천 정보 조회 (얼굴형과 성별 모두 사용)
+        face_shape_data = self._recommendations_db[face_shape_type]
+        # 해당 성별 정보가 없으면 남성(0) 정보 사용 (예외처리)
+        recommendation_data = face_shape_data.get(gender_key, face_shape_data.get(0))
+
+        # 추천 스타일 value 리스트와 추천 이유
+        recommended_style_values = recommendation_data.get("styles", [])
+        recommendation_reason = recommendation_data.get("reason", "추천 이유를 찾을 수 없습니다.")
+
+        # 추천 목록 순서대로 이름과 이미지 URL 매칭하여 리스트 생성
+        recommendations_details = []
+        for api_value in recommended_style_values:
+            korean_name = self._name_map.get(api_value, api_value) # Map에서 한국어 이름 찾기
+            image_url, image_variants = images.get(korean_name, ('placeholder.jpg', None))
+            recommendations_details.append({
+                "name": korean_name,
+                "image_url": image_url,
+                "image_variants": image_variants, # 반응형 srcset (변형을 만들지 않았으면 None)
+                "value": api_value
+            })
+
+        # 프론트엔드로 보낼 최종 결과 구성 (얼굴형, 성별 한국어 이름 포함)
+        return {
+            "face_shape_kr": self._face_shape_kr_map.get(face_shape_type, "알 수 없음"),
+            "gender_kr": self._gender_kr_map.get(gender_key, "알 수 없음"),
+            "recommendations": recommendations_details,
+            "reason": recommendation_reason
+        }
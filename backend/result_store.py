@@ -0,0 +1,154 @@
+# backend/result_store.py
+
+import hashlib
+import io
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from PIL import Image, ImageOps
+
+from ailab_client import ailab_get
+from ttl_cache import TTLCache
+
+# --- 결과 이미지 저장소 설정 ---
+RESULT_STORE_DIR = os.getenv('RESULT_STORE_DIR', 'results')
+RESULT_FETCH_WORKERS = int(os.getenv('RESULT_FETCH_WORKERS', '4'))
+RESULT_FETCH_MAX_BYTES = int(os.getenv('RESULT_FETCH_MAX_BYTES', str(20 * 1024 * 1024)))
+RESULT_THUMBNAIL_SIZE = int(os.getenv('RESULT_THUMBNAIL_SIZE', '320'))       # 썸네일 긴 변 길이(px)
+RESULT_THUMBNAIL_QUALITY = int(os.getenv('RESULT_THUMBNAIL_QUALITY', '80'))  # 썸네일 WebP 품질
+# 원격 URL -> 저장된 파일명 기억 개수 (같은 결과를 다시 내려받지 않도록)
+RESULT_INDEX_MAX_ENTRIES = int(os.getenv('RESULT_INDEX_MAX_ENTRIES', '4096'))
+
+THUMBNAIL_SUFFIX = '.thumb.webp'
+_EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+_FILENAME_PATTERN = re.compile(r'^[0-9a-f]{64}(\.jpg|\.png|\.webp|\.thumb\.webp)$')
+_CHUNK_SIZE = 64 * 1024
+
+
+class ResultImageStore:
+    """AILab 결과 이미지를 내려받아 내용 해시(SHA-256) 파일명으로 디스크에 보관하는 저장소
+
+    - 같은 내용은 같은 파일명이 되므로 중복 저장하지 않고, 파일 내용이 바뀌지 않아 오래 캐시할 수 있습니다.
+    - 원본 옆에 WebP 썸네일(<해시>.thumb.webp)을 함께 만듭니다.
+    - 임시 파일에 쓴 뒤 이름을 바꾸므로 전송 중인 파일이 반쯤 쓰인 상태로 보이지 않습니다.
+    내려받기는 전용 스레드 풀에서 진행하며, 같은 URL에 대한 동시 요청은 하나로 합칩니다.
+    """
+
+    def __init__(self, directory=RESULT_STORE_DIR, max_workers=RESULT_FETCH_WORKERS,
+                 max_bytes=RESULT_FETCH_MAX_BYTES, thumbnail_size=RESULT_THUMBNAIL_SIZE,
+                 thumbnail_quality=RESULT_THUMBNAIL_QUALITY):
+        self.directory = os.path.abspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._thumbnail_size = thumbnail_size
+        self._thumbnail_quality = thumbnail_quality
+        self._stored = TTLCache(max_entries=RESULT_INDEX_MAX_ENTRIES, ttl_seconds=86400)
+        self._pending = {}  # 원격 URL -> 내려받는 중인 Future
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='result-fetch')
+        self.fetched = 0
+        self.failed = 0
+        self.bytes_stored = 0
+
+    def store_async(self, remote_url):
+        """원격 결과 이미지를 백그라운드에서 저장하고, 저장된 파일명(실패 시 None)을 결과로 갖는 Future를 반환합니다."""
+        with self._lock:
+            filename = self._stored.get(remote_url)
+            if filename is not None:
+                future = Future()
+                future.set_result(filename)
+                return future
+            future = self._pending.get(remote_url)
+            if future is None:
+                future = self._executor.submit(self._fetch, remote_url)
+                self._pending[remote_url] = future
+            return future
+
+    def is_valid_filename(self, filename):
+        """저장소가 만드는 파일명 형식인지 확인합니다. (경로 조작 방지)"""
+        return bool(_FILENAME_PATTERN.match(filename))
+
+    def thumbnail_for(self, filename):
+        """저장된 원본 파일의 썸네일 파일명 (썸네일이 없으면 None)"""
+        thumbnail = filename.split('.', 1)[0] + THUMBNAIL_SUFFIX
+        return thumbnail if os.path.exists(os.path.join(self.directory, thumbnail)) else None
+
+    def stats(self):
+        return {
+            'fetched': self.fetched,
+            'failed': self.failed,
+            'pending': len(self._pending),
+            'bytes_stored': self.bytes_stored,
+            'index': self._stored.stats(),
+        }
+
+    def _fetch(self, remote_url):
+        filename = None
+        written = 0
+        try:
+            with ailab_get(remote_url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                data = self._read_limited(response)
+            filename, written = self._write(data)
+            print(f"결과 이미지 저장 완료: {filename} ({len(data)} bytes)")
+        except Exception as e:
+            print(f"결과 이미지 저장 실패 ({remote_url}): {e}")
+
+        with self._lock:
+            self._pending.pop(remote_url, None)
+            if filename is None:
+                self.failed += 1
+            else:
+                self._stored.set(remote_url, filename)
+                self.fetched += 1
+                self.bytes_stored += written
+        return filename
+
+    def _read_limited(self, response):
+        buffer = io.BytesIO()
+        for chunk in response.iter_content(_CHUNK_SIZE):
+            buffer.write(chunk)
+            if buffer.tell() > self._max_bytes:
+                raise ValueError(f"결과 이미지가 너무 큽니다. (최대 {self._max_bytes} bytes)")
+        return buffer.getvalue()
+
+    def _write(self, data):
+        """원본과 썸네일을 저장하고 (파일명, 새로 쓴 원본 크기)를 반환합니다. (같은 내용이 이미 있으면 0)"""
+        img = Image.open(io.BytesIO(data))
+        extension = _EXTENSIONS.get(img.format)
+        if extension is None:
+            raise ValueError(f"지원하지 않는 결과 이미지 형식: {img.format}")
+
+        digest = hashlib.sha256(data).hexdigest()
+        filename = f"{digest}.{extension}"
+        written = 0
+        if not os.path.exists(os.path.join(self.directory, filename)):
+            self._atomic_write(filename, data)
+            written = len(data)
+
+        thumbnail = digest + THUMBNAIL_SUFFIX
+        if not os.path.exists(os.path.join(self.directory, thumbnail)):
+            self._atomic_write(thumbnail, self._thumbnail(img))
+        return filename, written
+
+    def _thumbnail(self, img):
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'transparency' in img.info or img.mode in ('LA', 'PA') else 'RGB')
+        img.thumbnail((self._thumbnail_size, self._thumbnail_size))
+        buffer = io.BytesIO()
+        img.save(buffer, format='WEBP', quality=self._thumbnail_quality, method=4)
+        return buffer.getvalue()
+
+    def _atomic_write(self, filename, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            os.fchmod(fd, 0o644) # mkstemp 기본 권한(0600)이면 프록시 서버가 직접 서빙할 수 없음
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(self.directory, filename))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
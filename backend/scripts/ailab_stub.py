@@ -0,0 +1,85 @@
+# backend/scripts/ailab_stub.py
+
+import json
+import os
+import threading
+import time
+import uuid
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 벤치마크용 로컬 AILab 스텁 서버
+# - POST .../face-analyzer           -> 얼굴형/성별 분석 결과
+# - POST 그 외 경로(hairstyle-editor) -> task_id 발급
+# - GET  ...?task_id=<id>             -> done_after초가 지나면 완료(결과 이미지 URL), 그 전에는 처리 중
+# - GET  /img/<id>.jpg                -> 결과 이미지 (static/images/afro.jpg)
+# HTTP/1.1 keep-alive로 응답하므로 클라이언트 커넥션 재사용 효과를 그대로 측정할 수 있습니다.
+
+_IMAGE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'images', 'afro.jpg')
+
+
+class AILabStub:
+    """백그라운드 스레드에서 실행되는 스텁 서버 (base_url로 접근, counts에 호출 횟수 기록)"""
+
+    def __init__(self, done_after=1.0, latency=0.0):
+        self.done_after = done_after  # 작업이 완료되기까지 걸리는 시간(초)
+        self.latency = latency        # 모든 응답에 더하는 지연(초)
+        self.tasks = {}
+        self.counts = {'face': 0, 'submit': 0, 'poll': 0, 'image': 0}
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='ailab-stub', daemon=True).start()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True # 헤더와 본문을 따로 쓰므로, 켜 두면 keep-alive 응답마다 ~40ms 지연(지연 ACK)
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body, content_type='application/json'):
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if 'face-analyzer' in self.path:
+                    stub.counts['face'] += 1
+                    return self._send({'error_code': 0, 'face_detail_infos': [
+                        {'face_detail_attributes_info': {'shape': {'type': 2}, 'gender': {'type': 1}}}]})
+                stub.counts['submit'] += 1
+                task_id = uuid.uuid4().hex
+                stub.tasks[task_id] = time.monotonic()
+                self._send({'error_code': 0, 'task_id': task_id})
+
+            def do_GET(self):
+                if self.path.startswith('/img/'):
+                    stub.counts['image'] += 1
+                    with open(_IMAGE_PATH, 'rb') as f:
+                        return self._send(f.read(), 'image/jpeg')
+                stub.counts['poll'] += 1
+                task_id = self.path.split('task_id=')[-1]
+                submitted_at = stub.tasks.get(task_id, 0.0)
+                if time.monotonic() - submitted_at >= stub.done_after:
+                    return self._send({'error_code': 0, 'task_status': 2,
+                                       'data': {'images': [f"{stub.base_url}/img/{task_id}.jpg"]}})
+                self._send({'error_code': 0, 'task_status': 1})
+
+        return Handler
@@ -0,0 +1,65 @@
+# backend/scripts/bench_ailab_pool.py
+
+"""공유 keep-alive 세션(ailab_client)과 요청마다 새 연결(requests.get)의 폴링 지연 비교
+
+로컬 AILab 스텁에 같은 작업 결과 확인(GET) 요청을 반복해 보내고, 요청 1건당 지연 시간을 비교합니다.
+로컬 HTTP라 TLS 핸드셰이크 비용은 포함되지 않으므로 실제 AILab(HTTPS)에서는 절약 폭이 더 큽니다.
+
+사용법 (backend 폴더에서):
+    python scripts/bench_ailab_pool.py [--requests 500] [--latency 0]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # backend 폴더
+
+import requests
+from ailab_client import get_session
+from ailab_stub import AILabStub
+
+
+def measure(send, url, count):
+    """send(url)를 count번 호출하고 요청별 지연(ms) 목록을 반환합니다."""
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = send(url)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def summary(name, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{name:<28} 평균 {statistics.mean(ordered):7.3f}ms  p50 {statistics.median(ordered):7.3f}ms  p95 {p95:7.3f}ms")
+    return statistics.mean(ordered)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500, help='방식별 요청 수')
+    parser.add_argument('--latency', type=float, default=0.0, help='스텁 응답 지연(초)')
+    args = parser.parse_args()
+
+    stub = AILabStub(done_after=3600, latency=args.latency) # 폴링 응답은 항상 "처리 중"
+    url = f"{stub.base_url}/api/common/query-async-task-result?task_id=bench"
+    session = get_session()
+    try:
+        # 워밍업 (첫 연결, import 비용 제외)
+        measure(requests.get, url, 10)
+        measure(session.get, url, 10)
+
+        fresh = summary("requests.get (매번 새 연결)", measure(requests.get, url, args.requests))
+        pooled = summary("공유 세션 (keep-alive)", measure(session.get, url, args.requests))
+        print(f"폴링 1건당 절약: {fresh - pooled:.3f}ms ({(1 - pooled / fresh) * 100:.0f}%)")
+    finally:
+        stub.close()
+
+
+if __name__ == '__main__':
+    main()
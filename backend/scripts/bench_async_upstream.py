@@ -0,0 +1,145 @@
+# backend/scripts/bench_async_upstream.py
+
+"""동기 모드와 ASYNC_UPSTREAM 모드의 변환 처리량/메모리 비교 (로컬 AILab 스텁 대상 부하 테스트)
+
+스텁 서버는 이 프로세스에서 띄우고, 모드별로 앱을 별도 프로세스에서 실행해
+서로 다른 스타일의 변환 요청 N개를 한꺼번에 등록한 뒤 모두 끝날 때까지의
+- 처리량: 완료된 변환 수 / 경과 시간 (요청/초)
+- 메모리: 부하 중 최대 RSS와 부하 전 대비 증가량, 최대 스레드 수
+를 비교합니다. 스텁은 작업을 --done-after초 뒤에 완료하므로, 동시에 진행할 수 있는 작업 수가 처리량을 결정합니다.
+거버너/회로 차단기 한도는 비교에 끼어들지 않도록 넉넉하게 올립니다.
+
+사용법 (backend 폴더에서, 비동기 모드에는 httpx 필요):
+    python scripts/bench_async_upstream.py [--jobs 200] [--done-after 2]
+"""
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR) # backend 폴더
+
+from ailab_stub import AILabStub
+
+_FINISHED = ('succeeded', 'failed')
+
+
+def rss_bytes():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def run_load(base_url, jobs):
+    """(자식 프로세스) 앱을 스텁에 연결하고 변환 jobs개를 등록해 모두 끝날 때까지 측정합니다."""
+    import app as backend
+
+    backend.HAIRSTYLE_EDITOR_URL = f"{base_url}/api/portrait/effects/hairstyle-editor-pro"
+    backend.TASK_RESULT_URL = f"{base_url}/api/common/query-async-task-result"
+    backend.FACE_ANALYZER_URL = f"{base_url}/api/portrait/analysis/face-analyzer"
+    client = backend.app.test_client()
+    with open(os.path.join(BACKEND_DIR, 'static', 'images', 'afro.jpg'), 'rb') as f:
+        image = f.read()
+
+    def submit(style):
+        response = client.post('/api/transform-hairstyle', content_type='multipart/form-data',
+                               data={'image': (io.BytesIO(image), 'bench.jpg', 'image/jpeg'), 'hair_style': style})
+        return response.get_json()['job_id']
+
+    # 워밍업: 커넥션/스레드 풀, 이벤트 루프 준비
+    warmup = submit('Warmup')
+    while client.get(f'/api/transform-jobs/{warmup}').get_json()['status'] not in _FINISHED:
+        time.sleep(0.05)
+
+    baseline = rss_bytes()
+    peak = {'rss': baseline, 'threads': threading.active_count()}
+    done = threading.Event()
+
+    def sample():
+        while not done.is_set():
+            peak['rss'] = max(peak['rss'], rss_bytes())
+            peak['threads'] = max(peak['threads'], threading.active_count())
+            time.sleep(0.05)
+
+    threading.Thread(target=sample, daemon=True).start()
+    started = time.perf_counter()
+    job_ids = [submit(f'BenchStyle{i}') for i in range(jobs)]
+    submitted = time.perf_counter() - started
+    pending = set(job_ids)
+    statuses = {}
+    while pending:
+        for job_id in list(pending):
+            status = client.get(f'/api/transform-jobs/{job_id}').get_json()['status']
+            if status in _FINISHED:
+                statuses[job_id] = status
+                pending.discard(job_id)
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    done.set()
+
+    succeeded = sum(1 for status in statuses.values() if status == 'succeeded')
+    return {
+        'mode': 'async' if backend.ASYNC_UPSTREAM else 'sync',
+        'succeeded': succeeded,
+        'failed': jobs - succeeded,
+        'submit_seconds': round(submitted, 2),
+        'elapsed_seconds': round(elapsed, 2),
+        'rps': round(succeeded / elapsed, 1),
+        'peak_rss_mb': round(peak['rss'] / 2 ** 20, 1),
+        'rss_growth_mb': round((peak['rss'] - baseline) / 2 ** 20, 1),
+        'peak_threads': peak['threads'],
+    }
+
+
+def run_mode(mode, base_url, args, workdir):
+    env = dict(os.environ,
+               ASYNC_UPSTREAM='1' if mode == 'async' else '0',
+               DATABASE_URL=os.getenv('DATABASE_URL', f"sqlite:///{os.path.join(workdir, 'bench.db')}"),
+               RESULT_STORE_DIR=os.path.join(workdir, f'results-{mode}'),
+               POLL_MIN_INTERVAL='0.5', POLL_MAX_INTERVAL='1',
+               UPSTREAM_RATE_PER_SECOND='10000', UPSTREAM_BURST='10000',
+               UPSTREAM_MAX_IN_FLIGHT='10000', UPSTREAM_MAX_QUEUED='10000', UPSTREAM_MAX_QUEUED_PER_KEY='10000',
+               CIRCUIT_MIN_CALLS='1000000')
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', base_url, '--jobs', str(args.jobs)],
+                            cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    lines = output.stdout.strip().splitlines()
+    if output.returncode != 0 or not lines:
+        print(output.stdout[-2000:], output.stderr[-2000:])
+        raise SystemExit(f"{mode} 모드 실행 실패")
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=200, help='모드별 변환 요청 수')
+    parser.add_argument('--done-after', type=float, default=2.0, help='스텁이 작업을 완료하기까지 걸리는 시간(초)')
+    parser.add_argument('--modes', default='sync,async', help='비교할 모드 (sync, async)')
+    parser.add_argument('--child', metavar='BASE_URL', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_load(args.child, args.jobs)
+        print(json.dumps(result))
+        return
+
+    stub = AILabStub(done_after=args.done_after)
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            print(f"변환 {args.jobs}개, 스텁 완료 시간 {args.done_after}초")
+            print(f"{'모드':<7}{'성공':>6}{'실패':>6}{'경과':>9}{'요청/초':>9}{'최대 RSS':>11}{'RSS 증가':>11}{'스레드':>7}")
+            for mode in args.modes.split(','):
+                r = run_mode(mode, stub.base_url, args, workdir)
+                print(f"{r['mode']:<7}{r['succeeded']:>6}{r['failed']:>6}{r['elapsed_seconds']:>8}s{r['rps']:>9}"
+                      f"{r['peak_rss_mb']:>9}MB{r['rss_growth_mb']:>9}MB{r['peak_threads']:>7}")
+    finally:
+        stub.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# backend/scripts/bench_image_pipeline.py
+
+"""이미지 정규화 단계(image_pipeline)의 디코딩+축소 시간을 메가픽셀당 ms로 측정
+
+해상도별 합성 사진(JPEG/PNG)을 만들어 normalize_image가 하는 처리와 같은 순서로
+- JPEG draft 모드로 축소 디코딩 후 축소 (현재 방식)
+- draft 없이 원본 크기로 전부 디코딩 후 축소 (비교용)
+을 반복 실행하고, 원본 메가픽셀당 처리 시간과 AILab으로 보내는 바이트 수를 비교합니다.
+
+사용법 (backend 폴더에서):
+    python scripts/bench_image_pipeline.py [--repeat 5] [--sizes 3000x2000,4000x3000,6000x4000]
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # backend 폴더
+
+from PIL import Image, ImageFilter
+from image_pipeline import UPSTREAM_MAX_DIMENSION, NORMALIZE_JPEG_QUALITY, _normalize
+from image_probe import ValidatedImage
+
+
+def make_photo(width, height, image_format):
+    """사진과 비슷하게 압축되도록 노이즈를 흐린 합성 이미지를 만듭니다."""
+    small = Image.effect_noise((max(1, width // 8), max(1, height // 8)), 64).convert('RGB')
+    img = small.resize((width, height), Image.Resampling.BILINEAR).filter(ImageFilter.GaussianBlur(2))
+    output = io.BytesIO()
+    if image_format == 'jpeg':
+        img.save(output, 'JPEG', quality=92)
+    else:
+        img.save(output, 'PNG')
+    return output.getvalue()
+
+
+def decode_without_draft(upload, max_dimension, quality):
+    """draft 모드를 쓰지 않는 비교용 정규화 (원본 크기로 디코딩한 뒤 축소)"""
+    upload.stream.seek(0)
+    img = Image.open(upload.stream).convert('RGB')
+    img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+    output = io.BytesIO()
+    img.save(output, 'JPEG', quality=quality, optimize=True)
+    upload.stream.seek(0)
+    return output.getbuffer().nbytes
+
+
+def measure(fn, data, image_format, width, height, repeat):
+    """fn을 repeat번 실행해 (중앙값 ms, 결과 바이트 수)를 반환합니다."""
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        upload = ValidatedImage(io.BytesIO(data), image_format, width, height, f"bench.{image_format}")
+        started = time.perf_counter()
+        result = fn(upload, UPSTREAM_MAX_DIMENSION, NORMALIZE_JPEG_QUALITY)
+        timings.append((time.perf_counter() - started) * 1000)
+        size = result if isinstance(result, int) else result.size
+    return statistics.median(timings), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='측정 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--sizes', default='3000x2000,4000x3000,6000x4000', help='쉼표로 구분한 WxH 목록 (기준 크기 이하 JPEG는 축소 없이 통과하므로 그보다 크게)')
+    args = parser.parse_args()
+
+    # 정규화 출력은 print로 로그를 남기므로 측정 중에는 숨김
+    quiet = open(os.devnull, 'w')
+    print(f"기준 크기 {UPSTREAM_MAX_DIMENSION}px, JPEG 품질 {NORMALIZE_JPEG_QUALITY}")
+    print(f"{'입력':<20}{'원본':>11}{'방식':>14}{'시간':>11}{'ms/MP':>9}{'전송':>11}")
+    for spec in args.sizes.split(','):
+        width, height = (int(value) for value in spec.split('x'))
+        megapixels = width * height / 1_000_000
+        for image_format in ('jpeg', 'png'):
+            data = make_photo(width, height, image_format)
+            cases = [('draft+축소', _normalize), ('전체 디코딩', decode_without_draft)] if image_format == 'jpeg' \
+                else [('재인코딩', _normalize)]
+            for name, fn in cases:
+                stdout, sys.stdout = sys.stdout, quiet
+                try:
+                    elapsed, sent = measure(fn, data, image_format, width, height, args.repeat)
+                finally:
+                    sys.stdout = stdout
+                print(f"{image_format} {spec:<15}{len(data) / 1024:>9.0f}KB{name:>14}{elapsed:>9.1f}ms"
+                      f"{elapsed / megapixels:>9.2f}{sent / 1024:>9.0f}KB")
+
+
+if __name__ == '__main__':
+    main()
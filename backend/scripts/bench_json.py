@@ -0,0 +1,99 @@
+# backend/scripts/bench_json.py
+
+"""엔드포인트별 JSON 응답의 전송 바이트와 직렬화 CPU 비교 (표준 json provider vs orjson provider)
+
+시드 데이터(seed_hairstyles)로 채운 DB에서 각 GET 엔드포인트의 응답 데이터를 한 번 가져온 뒤,
+- 직렬화 CPU: Flask 기본 provider와 FastJSONProvider의 response()를 반복 호출한 요청당 CPU 시간
+- 전송 바이트: 표준 json 본문, orjson 본문, 그리고 앱의 압축 훅을 거친 gzip/br 본문 크기
+를 출력합니다.
+
+DATABASE_URL을 지정하지 않으면 임시 SQLite를 만들어 측정합니다. (지정한 DB의 데이터는 건드리지 않음)
+
+사용법 (backend 폴더에서):
+    python scripts/bench_json.py [--repeat 2000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # backend 폴더
+
+_temp_db = None
+if not os.getenv('DATABASE_URL'):
+    _temp_db = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    os.environ['DATABASE_URL'] = f"sqlite:///{_temp_db.name}"
+
+from flask.json.provider import DefaultJSONProvider
+from app import app, catalog_index
+from extensions import db
+from json_provider import FastJSONProvider
+from compression import brotli
+
+ENDPOINTS = [
+    ('검색 (q=컷)', '/api/search-hairstyles?q=컷'),
+    ('목록 (limit=100)', '/api/search-hairstyles?limit=100'),
+    ('스타일 정보', '/api/hairstyle-info?value=Ponytail'),
+    ('자동완성 (q=ㅅ)', '/api/hairstyles/autocomplete?q=ㅅ'),
+    ('서비스 통계', '/api/stats'),
+]
+
+
+def seed_temp_db():
+    from seed_hairstyles import seed_data
+    with app.app_context():
+        db.create_all()
+    seed_data()
+    with app.app_context():
+        catalog_index.invalidate()
+        catalog_index.ensure_fresh()
+
+
+def cpu_per_call(provider, payload, repeat):
+    """provider.response(payload)의 호출당 CPU 시간(µs)"""
+    started = time.process_time()
+    for _ in range(repeat):
+        provider.response(payload)
+    return (time.process_time() - started) / repeat * 1_000_000
+
+
+def encoded_size(client, path, encoding):
+    response = client.get(path, headers={'Accept-Encoding': encoding})
+    if response.headers.get('Content-Encoding') != encoding:
+        return None # 압축 기준 크기 미만 등으로 압축하지 않음
+    return len(response.get_data())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=2000, help='엔드포인트별 직렬화 반복 횟수')
+    args = parser.parse_args()
+
+    try:
+        if _temp_db is not None:
+            seed_temp_db()
+        client = app.test_client()
+        standard = DefaultJSONProvider(app)
+        fast = FastJSONProvider(app)
+        print(f"JSON backend: {fast.backend}, brotli: {'있음' if brotli else '없음'}")
+        print(f"{'엔드포인트':<18}{'json':>9}{'orjson':>9}{'gzip':>8}{'br':>8}{'json CPU':>12}{'orjson CPU':>12}")
+        for name, path in ENDPOINTS:
+            payload = client.get(path).get_json()
+            with app.app_context():
+                standard_size = len(standard.response(payload).get_data())
+                fast_size = len(fast.response(payload).get_data())
+                standard_cpu = cpu_per_call(standard, payload, args.repeat)
+                fast_cpu = cpu_per_call(fast, payload, args.repeat)
+            sizes = [encoded_size(client, path, encoding) for encoding in ('gzip', 'br')]
+            gzip_size, br_size = ('-' if size is None else f"{size}B" for size in sizes)
+            print(f"{name:<18}{standard_size:>8}B{fast_size:>8}B{gzip_size:>8}{br_size:>8}"
+                  f"{standard_cpu:>10.1f}µs{fast_cpu:>10.1f}µs")
+    finally:
+        if _temp_db is not None:
+            os.unlink(_temp_db.name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# backend/scripts/bench_recommendations.py
+
+"""analyze_face의 AILab 응답 이후 구간: 미리 만든 추천 응답 조회와 매번 조립하는 방식의 요청당 CPU 비교
+
+(얼굴형, 성별) 조합을 돌아가며
+- 미리 생성: recommendation_responses.get + response_class (현재 방식)
+- 매번 조립(인덱스): 카탈로그 인덱스에서 이미지 조회 + 추천 dict 조립 + jsonify
+- 매번 조립(DB): 추천 스타일 이미지를 DB에서 조회 + 추천 dict 조립 + jsonify (카탈로그 인덱스 이전 방식)
+을 반복하고 요청 1건당 CPU 시간(process_time)을 출력합니다.
+
+DATABASE_URL을 지정하지 않으면 임시 SQLite에 추천 목록의 헤어스타일만 넣어 측정합니다.
+
+사용법 (backend 폴더에서):
+    python scripts/bench_recommendations.py [--requests 5000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # backend 폴더
+
+_temp_db = None
+if not os.getenv('DATABASE_URL'):
+    _temp_db = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    os.environ['DATABASE_URL'] = f"sqlite:///{_temp_db.name}"
+
+from flask import jsonify
+from app import app, catalog_index, recommendation_responses, recommendations_db, hairstyle_name_map
+from extensions import db
+from models import Hairstyle
+from recommendations import OTHER_GENDER
+
+
+def seed_temp_db():
+    """임시 SQLite에 테이블을 만들고 추천 목록의 헤어스타일을 넣습니다."""
+    db.create_all()
+    for name in sorted(set(hairstyle_name_map.values())):
+        db.session.add(Hairstyle(name=name, description=f"{name} 설명", image_url=f"/static/images/{name}.jpg"))
+    db.session.commit()
+    catalog_index.invalidate()
+    catalog_index.ensure_fresh()
+
+
+def precomputed(face_shape_type, gender_type):
+    body = recommendation_responses.get(face_shape_type, gender_type)
+    return app.response_class(body, mimetype='application/json')
+
+
+def assemble(face_shape_type, gender_type, images_for):
+    gender_key = gender_type if gender_type in (0, 1) else OTHER_GENDER
+    face_shape_data = recommendations_db.get(face_shape_type, recommendations_db["unknown"])
+    recommendation_data = face_shape_data.get(gender_key, face_shape_data.get(0))
+    names = [hairstyle_name_map.get(value, value) for value in recommendation_data.get("styles", [])]
+    images = images_for(names)
+    return jsonify(recommendation_responses._build(face_shape_type, gender_key, images))
+
+
+def images_from_db(names):
+    found_styles = Hairstyle.query.filter(Hairstyle.name.in_(names)).all()
+    return {style.name: (style.image_url, style.image_variants) for style in found_styles}
+
+
+def measure(name, handler, combos, count):
+    """handler(face_shape_type, gender_type)를 count번 호출하고 요청당 CPU/경과 시간(µs)을 출력합니다."""
+    for face_shape_type, gender_type in combos: # 워밍업
+        handler(face_shape_type, gender_type)
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    for i in range(count):
+        face_shape_type, gender_type = combos[i % len(combos)]
+        handler(face_shape_type, gender_type)
+    cpu = (time.process_time() - cpu_started) / count * 1_000_000
+    wall = (time.perf_counter() - wall_started) / count * 1_000_000
+    print(f"{name:<20} CPU {cpu:9.1f}µs/요청   경과 {wall:9.1f}µs/요청")
+    return cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000, help='방식별 요청 수')
+    args = parser.parse_args()
+
+    combos = [(face_shape_type, gender_type)
+              for face_shape_type in recommendations_db for gender_type in (0, 1, 2)]
+    try:
+        with app.test_request_context('/api/analyze-face', method='POST'):
+            if _temp_db is not None:
+                seed_temp_db()
+            print(f"조합 {len(combos)}개, 카탈로그 {catalog_index.stats()['entries']}개")
+            baseline = measure("미리 생성", precomputed, combos, args.requests)
+            indexed = measure("매번 조립(인덱스)",
+                              lambda shape, gender: assemble(shape, gender, catalog_index.images_for),
+                              combos, args.requests)
+            queried = measure("매번 조립(DB)",
+                              lambda shape, gender: assemble(shape, gender, images_from_db),
+                              combos, max(1, args.requests // 10))
+            print(f"요청당 CPU 절약: 인덱스 대비 {indexed - baseline:.1f}µs ({indexed / baseline:.1f}배), "
+                  f"DB 대비 {queried - baseline:.1f}µs ({queried / baseline:.1f}배)")
+    finally:
+        if _temp_db is not None:
+            os.unlink(_temp_db.name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+# backend/search_index.py
+
+import bisect
+import os
+import re
+import threading
+from collections import defaultdict
+
+from hangul import decompose
+from ttl_cache import TTLCache
+from pagination import SCORE_DIGITS
+
+# 검색 결과에 포함할 최소 점수 (기존 pg_trgm similarity 임계값과 같은 기준)
+SEARCH_SCORE_THRESHOLD = float(os.getenv('SEARCH_SCORE_THRESHOLD', '0.2'))
+SEARCH_RESULT_LIMIT = 20
+# 정규화된 검색어별 결과 캐시 (카탈로그가 바뀌면 비움)
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', '1024'))
+
+# 설명(description) 일치는 이름 일치보다 낮게 반영
+_DESCRIPTION_WEIGHT = 0.6
+# 검색어가 그대로 포함된 경우의 가산점 (기존 ILIKE 검색 결과가 앞쪽에 오도록)
+_NAME_SUBSTRING_BONUS = 0.5
+_DESCRIPTION_SUBSTRING_BONUS = 0.1
+
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def normalize(text):
+    """검색용 정규화: 소문자 변환, 한글 자모 분해, 구두점 제거, 공백 정리"""
+    if not text:
+        return ''
+    return ' '.join(_NON_WORD.sub(' ', decompose(text.lower())).split())
+
+
+def trigrams(normalized_text):
+    """pg_trgm과 같은 방식으로 단어마다 앞 공백 2개, 뒤 공백 1개를 붙여 3글자씩 자른 집합"""
+    grams = set()
+    for word in normalized_text.split():
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+class SearchIndex:
+    """헤어스타일 이름/설명에 대한 메모리 트라이그램 역색인
+
+    한국어는 자모 단위로 풀어서 트라이그램을 만들기 때문에 받침이 틀리거나 입력 중인 음절도 검색됩니다.
+    - 이름: 트라이그램 자카드 유사도 (pg_trgm similarity와 같은 계산)
+    - 설명: 검색어 트라이그램 중 설명에 들어 있는 비율 x 가중치
+    - 검색어가 이름/설명에 그대로 들어 있으면 가산점
+    카탈로그 변경 리스너로 등록해 두면 카탈로그가 바뀔 때 다시 만들어집니다.
+    """
+
+    def __init__(self, threshold=SEARCH_SCORE_THRESHOLD, cache_max_entries=SEARCH_CACHE_MAX_ENTRIES):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._docs = []          # (카탈로그 행, 정규화된 이름, 정규화된 설명, 이름 트라이그램 수)
+        self._name_postings = {}
+        self._description_postings = {}
+        self.version = None
+        self._cache = TTLCache(max_entries=cache_max_entries, ttl_seconds=86400)
+
+    @property
+    def is_ready(self):
+        return self.version is not None
+
+    def rebuild(self, catalog_index):
+        """카탈로그 전체로 역색인을 다시 만듭니다. (카탈로그 변경 리스너)"""
+        docs = []
+        name_postings = defaultdict(list)
+        description_postings = defaultdict(list)
+        for doc_id, row in enumerate(catalog_index.rows()):
+            name = normalize(row['name'])
+            description = normalize(row['description'])
+            name_grams = trigrams(name)
+            for gram in name_grams:
+                name_postings[gram].append(doc_id)
+            for gram in trigrams(description):
+                description_postings[gram].append(doc_id)
+            docs.append((row, name, description, len(name_grams)))
+
+        with self._lock:
+            self._docs = docs
+            self._name_postings = dict(name_postings)
+            self._description_postings = dict(description_postings)
+            self.version = catalog_index.version
+            self._cache.clear()
+        print(f"검색 인덱스 생성 완료: {len(docs)}개, 트라이그램 {len(name_postings) + len(description_postings)}개")
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT, after=None):
+        """점수가 높은 순(같으면 이름순)으로 (점수, 카탈로그 행) 목록을 최대 limit개 반환합니다.
+
+        after=(점수, 이름)을 주면 그 항목 다음부터 반환합니다. (키셋 페이지네이션)
+        """
+        keys, rows = self._ranked(query)
+        start = 0 if after is None else bisect.bisect_right(keys, (-after[0], after[1]))
+        return [(-keys[i][0], rows[i]) for i in range(start, min(start + limit, len(rows)))]
+
+    def _ranked(self, query):
+        """검색어에 대한 전체 순위 목록 ([(-점수, 이름)], [카탈로그 행]) - 검색어별로 캐시"""
+        normalized_query = normalize(query)
+        if not normalized_query:
+            return [], []
+        with self._lock:
+            docs = self._docs
+            name_postings = self._name_postings
+            description_postings = self._description_postings
+            version = self.version
+
+        # 인덱스 버전을 키에 넣어, 재생성 중에 계산된 이전 결과가 섞이지 않도록 함
+        cache_key = (version, normalized_query)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        query_grams = trigrams(normalized_query)
+        name_shared = defaultdict(int)
+        description_shared = defaultdict(int)
+        for gram in query_grams:
+            for doc_id in name_postings.get(gram, ()):
+                name_shared[doc_id] += 1
+            for doc_id in description_postings.get(gram, ()):
+                description_shared[doc_id] += 1
+
+        # 트라이그램이 겹치지 않아도 검색어가 그대로 포함된 경우(짧은 검색어 등)를 놓치지 않도록 후보에 포함
+        candidates = set(name_shared) | set(description_shared)
+        candidates.update(doc_id for doc_id, (_, name, _, _) in enumerate(docs) if normalized_query in name)
+
+        scored = []
+        query_size = len(query_grams)
+        for doc_id in candidates:
+            row, name, description, name_size = docs[doc_id]
+            shared = name_shared.get(doc_id, 0)
+            name_score = shared / (query_size + name_size - shared) if shared else 0.0
+            description_score = _DESCRIPTION_WEIGHT * description_shared.get(doc_id, 0) / query_size if query_size else 0.0
+            score = max(name_score, description_score)
+            if normalized_query in name:
+                score += _NAME_SUBSTRING_BONUS
+            elif normalized_query in description:
+                score += _DESCRIPTION_SUBSTRING_BONUS
+            if score >= self.threshold:
+                # 커서에 담기는 점수와 같은 자릿수로 반올림해 두어야 after 위치를 정확히 찾음
+                scored.append(((-round(score, SCORE_DIGITS), row['name']), row))
+
+        scored.sort(key=lambda item: item[0])
+        ranked = ([key for key, _ in scored], [row for _, row in scored])
+        self._cache.set(cache_key, ranked)
+        return ranked
+
+    def stats(self):
+        return {
+            'ready': self.is_ready,
+            'version': self.version,
+            'entries': len(self._docs),
+            'query_cache': self._cache.stats(),
+        }
@@ -0,0 +1,40 @@
+# backend/search_query.py
+
+from decimal import Decimal
+from sqlalchemy import func, case, or_, and_, select, cast, Numeric
+
+from models import Hairstyle
+from pagination import SCORE_DIGITS
+
+
+def ranked_search_select(query, fields, limit, after=None):
+    """pg_trgm 순위 검색 SELECT 문 (search_hairstyles_db와 EXPLAIN 테스트가 함께 사용)
+
+    유사도(% 연산자)와 부분 문자열(ILIKE) 일치를 OR로 합쳐 GIN 트라이그램 인덱스
+    (idx_gin_hairstyle_name_trgm, idx_gin_hairstyle_description_trgm)로 후보를 찾고,
+    rank 컬럼(점수) 내림차순, 이름순으로 정렬합니다. after=(점수, 이름) 다음 항목부터 limit개
+    점수는 numeric으로 SCORE_DIGITS 자리에서 반올림해, 커서로 돌아온 점수와 정확히 같은 값으로 비교합니다.
+    """
+    table = Hairstyle.__table__
+    columns = [table.c[field] for field in dict.fromkeys(tuple(fields) + ('name',))] # 커서용 name은 항상 포함
+    name_contains = table.c.name.icontains(query, autoescape=True)
+    description_contains = table.c.description.icontains(query, autoescape=True)
+    # 검색어가 그대로 포함된 이름을 유사도만 높은 이름보다 앞에 둠 (메모리 검색 인덱스와 같은 기준)
+    rank = func.round(cast(func.similarity(table.c.name, query) + case(
+        (name_contains, 0.5),
+        (description_contains, 0.1),
+        else_=0.0
+    ), Numeric), SCORE_DIGITS).label('rank')
+    ranked = select(*columns, rank).where(or_(
+        table.c.name.op('%')(query),
+        name_contains,
+        description_contains
+    )).subquery()
+    stmt = select(ranked).order_by(ranked.c.rank.desc(), ranked.c.name).limit(limit)
+    if after and after[0] is not None:
+        after_score = Decimal(str(after[0])) # 커서 점수(float)를 반올림된 numeric 그대로 비교
+        stmt = stmt.where(or_(
+            ranked.c.rank < after_score,
+            and_(ranked.c.rank == after_score, ranked.c.name > after[1])
+        ))
+    return stmt
@@ -19,6 +19,7 @@ sys.path.insert(0, os.path.dirname(__file__)) # backend 폴더도 추가
 # 여기서는 app.py에 app 객체가 있다고 가정합니다.
 try:
     from app import app
+    from catalog import mark_catalog_changed
     # extensions.py 에서 db 객체 가져오기
     from extensions import db
 except ImportError as e:
@@ -134,6 +135,8 @@ def seed_data():
 
         try:
             db.session.add_all(hairstyles_to_add) # 여러 객체를 한 번에 추가 (더 효율적)
+            # 카탈로그 변경 표시를 같은 트랜잭션에서 올림 (실행 중인 서버들이 CATALOG_VERSION_CHECK_SECONDS 안에 다시 읽음)
+            mark_catalog_changed(db.session)
             db.session.commit()
             print("Successfully added new Hairstyle data.")
         except Exception as e:
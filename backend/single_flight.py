@@ -0,0 +1,76 @@
+# backend/single_flight.py
+
+import threading
+
+
+class SingleFlightTimeout(TimeoutError):
+    """먼저 시작된 동일 요청의 결과를 제한 시간 안에 받지 못했을 때 발생"""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 작업을 한 번만 실행하고 결과를 공유합니다.
+
+    처음 도착한 호출자(리더)가 fn을 실행하고, 실행 중에 같은 키로 들어온 호출자들은
+    리더의 결과를 기다립니다. fn에서 발생한 예외는 기다리던 모든 호출자에게 그대로 전달됩니다.
+    결과는 실행이 끝나면 바로 버리므로 캐시가 아니라 "진행 중 요청 합치기" 용도입니다.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, timeout=None, **kwargs):
+        """key로 fn(*args, **kwargs)를 실행하거나, 진행 중인 실행 결과를 기다립니다.
+
+        timeout은 다른 호출자의 결과를 기다리는 최대 시간(초)이며, 초과 시 SingleFlightTimeout.
+        (리더 자신의 실행 시간은 fn 내부의 타임아웃이 제한합니다.)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self.leaders += 1
+                is_leader = True
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                is_leader = False
+
+        if is_leader:
+            try:
+                call.result = fn(*args, **kwargs)
+            except BaseException as e:
+                call.exception = e
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.done.set()
+        elif not call.done.wait(timeout):
+            raise SingleFlightTimeout(f"동일 요청의 결과 대기 시간 초과 (key: {key})")
+
+        if call.exception is not None:
+            raise call.exception
+        return call.result
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'leaders': self.leaders,
+                'coalesced': self.coalesced,
+            }
@@ -0,0 +1,245 @@
+# backend/task_poller.py
+
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# --- 폴링 스케줄 설정 ---
+POLL_MIN_INTERVAL = float(os.getenv('POLL_MIN_INTERVAL', '1.0'))     # 첫 확인 간격(초)
+POLL_MAX_INTERVAL = float(os.getenv('POLL_MAX_INTERVAL', '8.0'))     # 최대 확인 간격(초)
+POLL_BACKOFF_FACTOR = float(os.getenv('POLL_BACKOFF_FACTOR', '1.5')) # 확인할 때마다 간격 증가 배율
+POLL_JITTER = float(os.getenv('POLL_JITTER', '0.2'))                 # 간격에 ±20% 무작위 편차
+POLL_MAX_WAIT_SECONDS = float(os.getenv('POLL_MAX_WAIT_SECONDS', '100'))
+POLL_WORKERS = int(os.getenv('POLL_WORKERS', '8'))                   # 동시에 진행할 확인 요청 수
+
+# 최근 작업 완료 시간 샘플 수 (첫 확인 시점 조정용)
+_COMPLETION_SAMPLES = 50
+
+
+class TaskPoller:
+    """진행 중인 모든 AILab task_id를 하나의 스케줄러 스레드에서 폴링하는 서비스
+
+    요청마다 sleep 루프를 돌리는 대신, 대기 중인 작업을 한곳에 모아
+    다음 확인 시각이 된 작업만 확인 요청을 보냅니다.
+    - 처음에는 짧은 간격으로 확인하고, 이후 지터를 섞어 점점 간격을 늘립니다.
+    - 최근 작업들의 완료 시간을 기록해, 보통 그보다 일찍 끝나지 않는 작업은
+      첫 확인을 그만큼 늦춰 불필요한 호출을 줄입니다.
+    - 작업이 끝나면 기다리던 호출자를 바로 깨웁니다.
+
+    check_fn(task_id, api_key)는 작업이 아직 진행 중이면 None 또는 {"pending": True, "task_status": ...}를,
+    끝났으면 poll_for_result와 같은 형태의 결과 dict를 반환해야 합니다.
+    진행 중 응답은 wait(on_progress=...)로 등록한 콜백에 그대로 전달됩니다.
+    asyncio 모드에서는 wait_async로 같은 스케줄(첫 확인 시점, 백오프, 지터)을 이벤트 루프에서 사용합니다.
+    """
+
+    def __init__(self, check_fn, max_workers=POLL_WORKERS):
+        self._check_fn = check_fn
+        self._max_workers = max_workers
+        self._tasks = {}  # task_id -> 대기 정보
+        self._cond = threading.Condition()
+        self._completions = deque(maxlen=_COMPLETION_SAMPLES)
+        self._executor = None
+        self._thread = None
+        self._upstream_calls = 0
+        self._completed = 0
+        self._async_waiting = 0
+
+    def wait(self, task_id, api_key, submitted_at=None, timeout=POLL_MAX_WAIT_SECONDS, on_progress=None):
+        """task_id의 결과가 나올 때까지 기다렸다가 결과 dict를 반환합니다.
+
+        on_progress(info)는 확인할 때마다 작업이 아직 진행 중이면 호출됩니다.
+        info: {"task_status": AILab 작업 상태(0 대기, 1 처리 중, 모르면 None), "attempts": 확인 횟수, "elapsed": 경과 초}
+        """
+        self._ensure_started()
+        now = time.monotonic()
+        submitted_at = submitted_at or now
+        with self._cond:
+            entry = self._tasks.get(task_id)
+            if entry is None:
+                entry = {
+                    'task_id': task_id,
+                    'api_key': api_key,
+                    'submitted_at': submitted_at,
+                    'deadline': now + timeout,
+                    'next_poll_at': submitted_at + self._first_delay(),
+                    'interval': POLL_MIN_INTERVAL,
+                    'attempts': 0,
+                    'in_flight': False,
+                    'event': threading.Event(),
+                    'result': None,
+                    'listeners': [],
+                }
+                self._tasks[task_id] = entry
+                self._cond.notify()
+            if on_progress is not None:
+                entry['listeners'].append(on_progress)
+
+        # 스케줄러가 마감 시각에 결과를 채워주지만, 만일을 대비해 여유를 두고 대기
+        if not entry['event'].wait(timeout + POLL_MAX_INTERVAL + 30):
+            return {"error": True, "message": "최대 대기 시간 초과. 결과 확인에 실패했습니다."}
+        return entry['result']
+
+    async def wait_async(self, check_coro, task_id, api_key, submitted_at=None, timeout=POLL_MAX_WAIT_SECONDS,
+                         on_progress=None):
+        """wait의 asyncio 버전: 스케줄러 스레드 대신 asyncio.sleep으로 간격을 두고 직접 확인합니다.
+
+        check_coro(task_id, api_key)는 check_fn과 같은 값을 반환하는 코루틴 함수여야 합니다.
+        다음 확인 시각까지 스레드를 붙잡지 않으므로 하나의 이벤트 루프에서 많은 작업을 함께 기다릴 수 있습니다.
+        완료 시간 기록과 호출 수 통계는 wait와 함께 사용합니다.
+        """
+        now = time.monotonic()
+        submitted_at = submitted_at or now
+        deadline = now + timeout
+        with self._cond:
+            next_poll_at = submitted_at + self._first_delay()
+            self._async_waiting += 1
+        entry = {'interval': POLL_MIN_INTERVAL, 'attempts': 0, 'submitted_at': submitted_at}
+
+        try:
+            while True:
+                delay = min(next_poll_at, deadline) - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if time.monotonic() >= deadline:
+                    with self._cond:
+                        self._completed += 1
+                    return {"error": True, "message": "최대 대기 시간 초과. 결과 확인에 실패했습니다."}
+
+                entry['attempts'] += 1
+                try:
+                    result = await check_coro(task_id, api_key)
+                except Exception as e:
+                    print(f"결과 확인 중 예상치 못한 내부 오류: {e}")
+                    result = {"error": True, "message": "결과 확인 중 서버 내부 오류 발생"}
+
+                pending = result is None or result.get("pending")
+                with self._cond:
+                    self._upstream_calls += 1
+                    if not pending:
+                        if not result.get("error"):
+                            self._completions.append(time.monotonic() - submitted_at)
+                        self._completed += 1
+                if not pending:
+                    return result
+
+                next_poll_at = time.monotonic() + self._next_interval(entry)
+                if on_progress is not None:
+                    self._notify_progress((on_progress,), entry, result)
+        finally:
+            with self._cond:
+                self._async_waiting -= 1
+
+    def stats(self):
+        with self._cond:
+            samples = sorted(self._completions)
+            return {
+                'pending_tasks': len(self._tasks),
+                'async_waiting_tasks': self._async_waiting,
+                'upstream_calls': self._upstream_calls,
+                'completed_tasks': self._completed,
+                'median_completion_seconds': round(samples[len(samples) // 2], 2) if samples else None,
+                'first_poll_delay_seconds': round(self._first_delay(), 2),
+            }
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._cond:
+            if self._thread is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='task-poll')
+                self._thread = threading.Thread(target=self._run, name='task-poller', daemon=True)
+                self._thread.start()
+
+    def _first_delay(self):
+        """최근 완료 시간의 하위 25% 지점 직전까지는 확인하지 않음 (샘플이 없으면 최소 간격)"""
+        if len(self._completions) < 5:
+            return POLL_MIN_INTERVAL
+        samples = sorted(self._completions)
+        p25 = samples[len(samples) // 4]
+        return min(max(POLL_MIN_INTERVAL, p25 * 0.9), POLL_MAX_WAIT_SECONDS / 2)
+
+    def _next_interval(self, entry):
+        interval = entry['interval']
+        entry['interval'] = min(interval * POLL_BACKOFF_FACTOR, POLL_MAX_INTERVAL)
+        return interval * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                due = []
+                next_wakeup = None
+                for entry in list(self._tasks.values()):
+                    if entry['in_flight']:
+                        continue
+                    if now >= entry['deadline']:
+                        self._finish(entry, {"error": True, "message": "최대 대기 시간 초과. 결과 확인에 실패했습니다."})
+                        continue
+                    wake_at = min(entry['next_poll_at'], entry['deadline'])
+                    if wake_at <= now:
+                        entry['in_flight'] = True
+                        due.append(entry)
+                    elif next_wakeup is None or wake_at < next_wakeup:
+                        next_wakeup = wake_at
+
+                if not due:
+                    self._cond.wait(None if next_wakeup is None else next_wakeup - now)
+                    continue
+
+            try:
+                for entry in due:
+                    self._executor.submit(self._poll_once, entry)
+            except RuntimeError:
+                # 인터프리터 종료 중이면 executor가 새 작업을 받지 않음: 대기자를 모두 깨우고 종료
+                with self._cond:
+                    for entry in list(self._tasks.values()):
+                        self._finish(entry, {"error": True, "message": "서버 종료 중이라 결과 확인을 중단했습니다."})
+                return
+
+    def _poll_once(self, entry):
+        entry['attempts'] += 1
+        try:
+            result = self._check_fn(entry['task_id'], entry['api_key'])
+        except Exception as e:
+            print(f"결과 확인 중 예상치 못한 내부 오류: {e}")
+            result = {"error": True, "message": "결과 확인 중 서버 내부 오류 발생"}
+
+        pending = result is None or result.get("pending")
+        with self._cond:
+            self._upstream_calls += 1
+            entry['in_flight'] = False
+            if pending:
+                # 아직 진행 중: 백오프 간격 뒤 다시 확인
+                entry['next_poll_at'] = time.monotonic() + self._next_interval(entry)
+            else:
+                if not result.get("error"):
+                    self._completions.append(time.monotonic() - entry['submitted_at'])
+                self._finish(entry, result)
+            listeners = list(entry['listeners']) if pending else ()
+            self._cond.notify()
+
+        # 진행 상황 콜백은 락 밖에서 호출 (구독자 전달이 느려도 스케줄러를 막지 않도록)
+        self._notify_progress(listeners, entry, result)
+
+    @staticmethod
+    def _notify_progress(listeners, entry, result):
+        for listener in listeners:
+            try:
+                listener({
+                    'task_status': result.get("task_status") if result else None,
+                    'attempts': entry['attempts'],
+                    'elapsed': round(time.monotonic() - entry['submitted_at'], 1),
+                })
+            except Exception as e:
+                print(f"폴링 진행 상황 콜백 오류: {e}")
+
+    def _finish(self, entry, result):
+        # self._cond를 잡은 상태에서 호출
+        self._tasks.pop(entry['task_id'], None)
+        self._completed += 1
+        entry['result'] = result
+        entry['event'].set()
@@ -0,0 +1,76 @@
+# backend/tests/test_catalog.py
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+from catalog import CatalogIndex, mark_catalog_changed
+from extensions import db
+from models import Hairstyle, CatalogVersion
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'catalog.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(CatalogVersion(id=1, version=0)) # 마이그레이션이 넣는 행
+        db.session.add(Hairstyle(name='단발컷', description='짧은 단발'))
+        db.session.commit()
+    return app
+
+
+def reseed(app, name, mark=True):
+    # 시드 스크립트 흉내: 다른 프로세스가 카탈로그를 바꾸고 (mark이면) 같은 트랜잭션에서 변경 표시를 올림
+    with app.app_context():
+        db.session.add(Hairstyle(name=name))
+        if mark:
+            mark_catalog_changed(db.session)
+        db.session.commit()
+
+
+def test_change_mark_from_another_process_reloads_index(app):
+    server = CatalogIndex({'BobCut': '단발컷', 'Afro': '아프로'}, refresh_seconds=3600, version_check_seconds=0)
+    with app.app_context():
+        assert server.find_by_value('BobCut')['name'] == '단발컷'
+        assert server.find_by_value('Afro') is None
+
+    reseed(app, '아프로')
+
+    with app.app_context():
+        assert server.find_by_value('Afro')['name'] == '아프로'
+        assert server.stats()['change_mark'] == 1
+
+
+def test_unmarked_change_waits_for_periodic_refresh(app):
+    server = CatalogIndex({'Afro': '아프로'}, refresh_seconds=3600, version_check_seconds=0)
+    with app.app_context():
+        server.ensure_fresh()
+
+    reseed(app, '아프로', mark=False)
+
+    with app.app_context():
+        assert server.find_by_value('Afro') is None
+
+
+def test_change_mark_is_checked_at_most_once_per_interval(app):
+    server = CatalogIndex({}, refresh_seconds=3600, version_check_seconds=3600)
+    statements = []
+    with app.app_context():
+        server.ensure_fresh()
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+        for _ in range(100):
+            server.ensure_fresh()
+    assert statements == [] # 확인 주기 안에는 요청이 DB를 조회하지 않음
+
+
+def test_mark_creates_missing_row(app):
+    with app.app_context():
+        db.session.delete(db.session.get(CatalogVersion, 1))
+        db.session.commit()
+        mark_catalog_changed(db.session)
+        mark_catalog_changed(db.session)
+        db.session.commit()
+        assert db.session.get(CatalogVersion, 1).version == 2
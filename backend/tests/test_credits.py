@@ -0,0 +1,155 @@
+# backend/tests/test_credits.py
+
+import random
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from credits import CreditLedger, CreditError
+from extensions import db
+from models import User
+
+INITIAL_CREDITS = 40
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'credits.db'}"
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'connect_args': {'timeout': 30}} # 쓰기 잠금을 기다림
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        user = User(google_id='g-1', email='user@example.com', credits=INITIAL_CREDITS)
+        db.session.add(user)
+        db.session.commit()
+        app.config['TEST_USER_ID'] = user.id
+    return app
+
+
+def db_credits(app):
+    with app.app_context():
+        return db.session.get(User, app.config['TEST_USER_ID']).credits
+
+
+WORKERS = 16
+ITERATIONS = 40
+FLUSH_EVERY = 5 # 작업 스레드가 직접 flush하는 간격 (반영과 예약이 반드시 겹치도록)
+
+
+def settle_plan(seed):
+    """worker(seed)가 모든 예약에 성공했을 때 (예약 크기, 정산 방식) 목록 - 난수 소비 순서가 worker와 같음"""
+    rng = random.Random(seed)
+    plan = []
+    for _ in range(ITERATIONS):
+        count = rng.randint(1, 3)
+        rng.random() # 대기 시간
+        plan.append((count, [rng.random() < 0.7 for _ in range(count)]))
+    return plan
+
+
+def run_workers(app, ledgers):
+    """WORKERS개 스레드가 예약 -> 정산/취소를 반복하고, FLUSH_EVERY번마다 장부를 직접 flush합니다."""
+    user_id = app.config['TEST_USER_ID']
+    lock = threading.Lock()
+    totals = {'outstanding': 0, 'settled': 0, 'rejected': 0, 'overdrawn': 0}
+
+    def worker(seed):
+        rng = random.Random(seed)
+        ledger = ledgers[seed % len(ledgers)]
+        for iteration in range(ITERATIONS):
+            count = rng.randint(1, 3)
+            with app.app_context():
+                if iteration % FLUSH_EVERY == 0:
+                    ledger.flush()
+                try:
+                    reservations = ledger.reserve(user_id, 1, count=count)
+                except CreditError:
+                    with lock:
+                        totals['rejected'] += 1
+                    continue
+            with lock:
+                totals['outstanding'] += count
+                # 예약 중인 크레딧과 사용 확정된 크레딧의 합은 처음 잔액을 넘을 수 없음
+                if totals['outstanding'] + totals['settled'] > INITIAL_CREDITS:
+                    totals['overdrawn'] += 1
+            time.sleep(rng.random() * 0.002)
+            for reservation in reservations:
+                refund = rng.random() < 0.7
+                with lock:
+                    (reservation.refund if refund else reservation.settle)()
+                    totals['outstanding'] -= 1
+                    totals['settled'] += 0 if refund else 1
+                    reservation.settle() # 이미 정산된 예약은 다시 반영되지 않음
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(WORKERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with app.app_context():
+        for ledger in ledgers:
+            ledger.flush()
+    return totals
+
+
+def test_concurrent_reserve_settle_refund(app):
+    # 모든 예약이 성공했다면 정산했을 크레딧이 잔액보다 훨씬 많으므로, 잔액 부족 거절은 반드시 일어남
+    demand = sum(settles.count(False) for seed in range(WORKERS) for _, settles in settle_plan(seed))
+    assert demand > 2 * INITIAL_CREDITS
+    ledger = CreditLedger(app, flush_interval=60, idle_seconds=0.0) # 백그라운드 반영 대신 작업 스레드가 flush
+
+    totals = run_workers(app, [ledger])
+
+    stats = ledger.stats()
+    assert totals['overdrawn'] == 0
+    assert totals['rejected'] > 0
+    assert 0 < totals['settled'] <= INITIAL_CREDITS
+    assert stats['settled'] == stats['charged_to_db'] == totals['settled']
+    assert stats['uncollected'] == 0
+    assert stats['in_flight'] == 0 and stats['pending'] == 0
+    assert db_credits(app) == INITIAL_CREDITS - totals['settled']
+
+
+def test_two_processes_never_drive_balance_negative(app):
+    # 같은 DB를 쓰는 프로세스 두 개: 각자 읽은 잔액으로 예약하므로 합계는 잔액을 넘을 수 있지만,
+    # 조건부 UPDATE로 DB 잔액은 음수가 되지 않고 차감하지 못한 양은 uncollected로 남음
+    ledgers = [CreditLedger(app, flush_interval=60, idle_seconds=0.0) for _ in range(2)]
+
+    totals = run_workers(app, ledgers)
+
+    stats = [ledger.stats() for ledger in ledgers]
+    charged = sum(s['charged_to_db'] for s in stats)
+    assert sum(s['settled'] for s in stats) == totals['settled']
+    assert charged + sum(s['uncollected'] for s in stats) == totals['settled']
+    assert all(s['in_flight'] == 0 and s['pending'] == 0 for s in stats)
+    assert 0 < charged <= INITIAL_CREDITS
+    assert db_credits(app) == INITIAL_CREDITS - charged >= 0
+
+
+def test_reserve_is_all_or_nothing(app):
+    user_id = app.config['TEST_USER_ID']
+    ledger = CreditLedger(app, flush_interval=60)
+    with app.app_context():
+        held = ledger.reserve(user_id, 1, count=INITIAL_CREDITS - 1)
+        with pytest.raises(CreditError):
+            ledger.reserve(user_id, 1, count=2) # 남은 1크레딧만으로는 부족: 하나도 예약하지 않음
+        assert ledger.stats()['in_flight'] == INITIAL_CREDITS - 1
+        ledger.reserve_one(user_id).refund()
+        for reservation in held:
+            reservation.settle()
+        assert db_credits(app) == INITIAL_CREDITS # 반영 전에는 DB 잔액을 건드리지 않음
+        ledger.flush()
+    assert db_credits(app) == 1
+
+
+def test_unflushed_reservations_leave_db_balance_intact(app):
+    # 예약하고 정산하기 전에 프로세스가 죽어도(장부를 버림) DB 잔액은 그대로
+    user_id = app.config['TEST_USER_ID']
+    with app.app_context():
+        CreditLedger(app, flush_interval=60).reserve(user_id, 1, count=10)
+        ledger = CreditLedger(app, flush_interval=60) # 재시작한 프로세스
+        assert len(ledger.reserve(user_id, 1, count=INITIAL_CREDITS)) == INITIAL_CREDITS
+    assert db_credits(app) == INITIAL_CREDITS
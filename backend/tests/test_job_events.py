@@ -0,0 +1,124 @@
+# backend/tests/test_job_events.py
+
+import asyncio
+import json
+import threading
+from concurrent.futures import Future
+
+from job_events import JobEventFeed, JobEventsASGI
+from transform_jobs import TransformJobStore
+
+
+def status_body(job):
+    body = {"job_id": job['job_id'], "status": job['status']}
+    if job['result']:
+        body.update(job['result'])
+    return body
+
+
+def make_app(jobs, fallback=None):
+    async def not_found(scope, receive, send):
+        await send({'type': 'http.response.start', 'status': 404, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b'fallback'})
+
+    feed = JobEventFeed(jobs, status_body, json.dumps, keepalive_seconds=0.05)
+    return JobEventsASGI(fallback or not_found, feed, allowed_origins=['http://localhost:5500'])
+
+
+def http_scope(path, origin=None):
+    headers = [(b'origin', origin.encode())] if origin else []
+    return {'type': 'http', 'method': 'GET', 'path': path, 'headers': headers}
+
+
+async def open_stream(application, path, disconnect=None, origin=None):
+    """ASGI 앱을 호출하고 보낸 메시지 목록을 반환 (disconnect가 set되면 클라이언트 연결 종료)"""
+    disconnect = disconnect or asyncio.Event()
+    messages = []
+
+    async def receive():
+        await disconnect.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(http_scope(path, origin), receive, send)
+    return messages
+
+
+def body_text(messages):
+    return b''.join(m.get('body', b'') for m in messages if m['type'] == 'http.response.body').decode()
+
+
+def finish_job(progress):
+    progress(stage='processing')
+    return {"result_image_url": "/results/done.jpg"}
+
+
+def test_open_streams_wait_without_threads():
+    # 스트림 300개가 이벤트를 기다리는 동안 스레드가 늘지 않고, 작업이 끝나면 모두 결과를 받고 닫힘
+    jobs = TransformJobStore(max_workers=1)
+    gate = Future()
+    job_id = jobs.submit(finish_job, report_progress=True, start_after=gate)
+    application = make_app(jobs)
+
+    async def scenario():
+        streams = [asyncio.ensure_future(open_stream(application, f'/api/transform-jobs/{job_id}/events'))
+                   for _ in range(300)]
+        while application.open_streams < 300:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.2) # keepalive 몇 번
+        threads_while_waiting = threading.active_count()
+        threading.Thread(target=gate.set_result, args=(None,)).start()
+        return threads_while_waiting, await asyncio.gather(*streams)
+
+    threads_before = threading.active_count()
+    threads_while_waiting, results = asyncio.run(scenario())
+
+    assert threads_while_waiting == threads_before
+    assert application.peak_open_streams == 300 and application.open_streams == 0
+    assert jobs._subscribers == {}
+    for messages in results:
+        text = body_text(messages)
+        assert messages[0]['status'] == 200
+        assert ': keepalive' in text
+        assert 'event: progress' in text and '"stage": "processing"' in text
+        assert text.rstrip().endswith('"result_image_url": "/results/done.jpg"}')
+        assert messages[-1] == {'type': 'http.response.body', 'body': b'', 'more_body': False}
+
+
+def test_disconnect_unsubscribes():
+    jobs = TransformJobStore(max_workers=1)
+    gate = Future()
+    job_id = jobs.submit(finish_job, report_progress=True, start_after=gate)
+    application = make_app(jobs)
+
+    async def scenario():
+        disconnect = asyncio.Event()
+        stream = asyncio.ensure_future(open_stream(application, f'/api/transform-jobs/{job_id}/events',
+                                                   disconnect, origin='http://localhost:5500'))
+        while application.open_streams < 1:
+            await asyncio.sleep(0.01)
+        disconnect.set()
+        return await stream
+
+    messages = asyncio.run(scenario())
+
+    headers = dict(messages[0]['headers'])
+    assert headers[b'content-type'].startswith(b'text/event-stream')
+    assert headers[b'access-control-allow-origin'] == b'http://localhost:5500'
+    assert '"status": "queued"' in body_text(messages) and '"stage": "waiting"' in body_text(messages)
+    assert application.open_streams == 0
+    assert jobs._subscribers == {}
+    gate.set_result(None) # 구독자가 없어도 작업은 끝남
+
+
+def test_unknown_job_and_other_paths_go_to_fallback():
+    application = make_app(TransformJobStore(max_workers=1))
+
+    async def scenario():
+        return [await open_stream(application, path) for path in
+                ('/api/transform-jobs/missing/events', '/api/transform-jobs/missing')]
+
+    for messages in asyncio.run(scenario()):
+        assert messages[0]['status'] == 404 and body_text(messages) == 'fallback'
@@ -0,0 +1,44 @@
+# backend/tests/test_json_provider.py
+
+import datetime
+import json
+
+import orjson
+import pytest
+from flask import Flask, jsonify
+
+from json_provider import FastJSONProvider
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    return app
+
+
+def test_jsonify_uses_orjson_output(app):
+    data = {'name': '레이어드 컷', 'price': 30000, 'created': datetime.datetime(2024, 1, 2, 3, 4, 5)}
+    with app.app_context():
+        body = jsonify(data).get_data()
+
+    # 한국어가 \uXXXX 이스케이프 없이 UTF-8 그대로, datetime은 기본 provider와 같은 HTTP 날짜 형식
+    assert '레이어드 컷'.encode('utf-8') in body
+    assert b'\\u' not in body
+    expected = {'name': '레이어드 컷', 'price': 30000, 'created': 'Tue, 02 Jan 2024 03:04:05 GMT'}
+    assert body == orjson.dumps(expected, option=orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE)
+
+
+def test_jsonify_indents_in_debug_mode(app):
+    app.debug = True
+    with app.app_context():
+        body = jsonify({'b': 1, 'a': '한'}).get_data()
+
+    assert body == orjson.dumps({'a': '한', 'b': 1}, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS) + b'\n'
+
+
+def test_unsupported_arguments_fall_back_to_stdlib(app):
+    with app.app_context():
+        text = app.json.dumps({'a': '한'}, indent=4)
+
+    assert text == json.dumps({'a': '한'}, indent=4, ensure_ascii=True, sort_keys=True)
@@ -0,0 +1,21 @@
+# backend/tests/test_pagination.py
+
+from decimal import Decimal
+
+from pagination import SCORE_DIGITS, encode_cursor, decode_cursor
+
+
+def test_cursor_score_round_trips_to_rounded_numeric():
+    # DB 순위 검색은 numeric으로 반올림한 점수(Decimal)를 돌려줌 - 커서를 거쳐도 같은 값이어야 경계 행을 정확히 찾음
+    score = round(Decimal('0.8333333134651184'), SCORE_DIGITS)
+    after_score, name = decode_cursor(encode_cursor(score, '레이어드 컷'))
+
+    assert Decimal(str(after_score)) == score
+    assert name == '레이어드 컷'
+
+
+def test_cursor_rounds_float4_scores():
+    # similarity()가 real(float4)로 돌려준 값을 그대로 넣어도 SCORE_DIGITS 자리로 고정됨
+    after_score, _ = decode_cursor(encode_cursor(0.8333333134651184, '레이어드 컷'))
+
+    assert after_score == 0.833333
@@ -0,0 +1,107 @@
+# backend/tests/test_upstream_governor.py
+
+import time
+
+import pytest
+
+from transform_jobs import TransformJobStore, JOB_SUCCEEDED, JOB_FAILED
+from upstream_governor import UpstreamGovernor, GovernorBusy
+
+
+def make_governor(max_in_flight, queue_timeout=60):
+    return UpstreamGovernor(rate=1000, burst=1000, max_in_flight=max_in_flight,
+                            max_queued=100, max_queued_per_key=100, queue_timeout=queue_timeout)
+
+
+def run_governed(ticket, timeout=5):
+    # app.run_governed와 같은 흐름: 슬롯을 기다린 뒤 작업, 끝나면 반환
+    try:
+        if not ticket.wait(timeout):
+            return {"error": "timeout", "status_code": 429}
+        return {"result_image_url": ticket.key}
+    finally:
+        ticket.release()
+
+
+def wait_finished(jobs, job_ids, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        statuses = [jobs.get(job_id)['status'] for job_id in job_ids]
+        if all(status in (JOB_SUCCEEDED, JOB_FAILED) for status in statuses):
+            return statuses
+        time.sleep(0.01)
+    return [jobs.get(job_id)['status'] for job_id in job_ids]
+
+
+def test_wait_times_out_and_leaves_queue():
+    governor = make_governor(max_in_flight=1)
+    running = governor.reserve('a')
+    waiting = governor.reserve('b')
+
+    assert waiting.wait(0.05) is False # concurrent.futures.TimeoutError를 잡아야 함 (3.10에서는 내장 TimeoutError와 다름)
+    assert governor.stats()['queued'] == 0
+    assert governor.stats()['queue_timeouts'] == 1
+    running.release()
+    assert governor.stats()['in_flight'] == 0
+
+
+def test_jobs_start_only_after_their_ticket_is_granted():
+    # 작업 스레드 1개, 슬롯 1개: 라운드 로빈은 a1 다음에 b1을 배정하지만 executor에는 a2가 먼저 들어감
+    # 슬롯을 받기 전에 스레드를 잡으면 a2가 스레드를 붙잡고 기다려 b1이 실행되지 못함
+    governor = make_governor(max_in_flight=1)
+    jobs = TransformJobStore(max_workers=1)
+    a1 = governor.reserve('a')
+    b1 = governor.reserve('b')
+    a2 = governor.reserve('a')
+    job_ids = [jobs.submit(run_governed, ticket, start_after=ticket.granted) for ticket in (a1, a2, b1)]
+
+    assert wait_finished(jobs, job_ids) == [JOB_SUCCEEDED] * 3
+    assert governor.stats()['queue_timeouts'] == 0
+
+
+def test_waiting_job_reports_waiting_stage():
+    governor = make_governor(max_in_flight=1)
+    jobs = TransformJobStore(max_workers=1)
+    running = governor.reserve('a')
+    waiting = governor.reserve('b')
+    job_id = jobs.submit(run_governed, waiting, start_after=waiting.granted)
+
+    assert jobs.get(job_id)['progress'] == {'stage': 'waiting'}
+    running.release()
+    assert wait_finished(jobs, [job_id]) == [JOB_SUCCEEDED]
+
+
+def test_group_only_queues_up_to_concurrency():
+    governor = make_governor(max_in_flight=10)
+    tickets = governor.reserve_group('a', 5, concurrency=2)
+
+    assert [ticket.granted.done() for ticket in tickets] == [True, True, False, False, False]
+    assert governor.stats()['parked'] == 3
+    tickets[0].release()
+    assert tickets[2].granted.result(0) is True
+    # 슬롯을 받기 전에 빠진 묶음 티켓도 다음 차례를 넘겨줌
+    tickets[3].release()
+    tickets[1].release()
+    assert tickets[4].granted.result(0) is True
+    assert governor.stats()['parked'] == 0
+
+
+def test_group_is_rejected_as_a_whole():
+    governor = UpstreamGovernor(rate=1000, burst=1000, max_in_flight=1, max_queued=100, max_queued_per_key=3)
+    governor.reserve('a')
+
+    with pytest.raises(GovernorBusy):
+        governor.reserve_group('a', 4, concurrency=2)
+    assert governor.stats()['queued'] == 0
+
+
+def test_governor_expires_tickets_nobody_is_waiting_on():
+    governor = make_governor(max_in_flight=1, queue_timeout=0.05)
+    running = governor.reserve('a')
+    waiting = governor.reserve('b')
+    time.sleep(0.1)
+    running.release()
+
+    assert waiting.granted.result(0) is False
+    assert governor.stats()['queue_timeouts'] == 1
+    assert governor.stats()['in_flight'] == 0
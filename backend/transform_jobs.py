@@ -0,0 +1,257 @@
+# backend/transform_jobs.py
+
+import asyncio
+import functools
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# 백그라운드 작업 스레드 수 / 완료된 작업 보관 시간(초)
+TRANSFORM_JOB_WORKERS = int(os.getenv('TRANSFORM_JOB_WORKERS', '16'))
+TRANSFORM_JOB_TTL_SECONDS = int(os.getenv('TRANSFORM_JOB_TTL_SECONDS', '3600'))
+
+# 작업 상태 값
+JOB_QUEUED = 'queued'
+JOB_PROCESSING = 'processing'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+
+
+class TransformJobStore:
+    """헤어스타일 변환 작업을 백그라운드에서 실행하고 상태를 보관하는 저장소
+
+    요청 스레드는 작업을 등록하고 job_id만 돌려받습니다. AILab 제출과 결과 폴링은
+    executor 스레드가 담당하므로 Flask 워커가 폴링 동안 붙잡혀 있지 않습니다.
+    주의: 작업 상태는 프로세스 메모리에 저장되므로 gunicorn 워커가 여러 개라면
+    같은 워커로 조회가 가도록 하거나(예: --workers 1 --threads N) 워커 수를 맞춰야 합니다.
+    runtime(AsyncRuntime)을 주면 코루틴 함수로 등록한 작업은 executor 스레드 대신 이벤트 루프에서 실행되어,
+    AILab 응답을 기다리는 동안 스레드를 차지하지 않습니다.
+    """
+
+    def __init__(self, max_workers=TRANSFORM_JOB_WORKERS, ttl_seconds=TRANSFORM_JOB_TTL_SECONDS, runtime=None):
+        self._jobs = {}
+        self._inflight_keys = {}  # dedupe_key -> 진행 중인 job_id
+        self._batches = {}        # batch_id -> 배치 정보 (여러 스타일을 한 번에 요청한 경우)
+        self._subscribers = {}    # job_id -> 상태 변경 이벤트를 받을 큐 목록 (SSE 스트림)
+        self._lock = threading.Lock()
+        self.coalesced = 0
+        self._ttl_seconds = ttl_seconds
+        self._runtime = runtime
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='transform-job')
+
+    def submit(self, fn, *args, dedupe_key=None, report_progress=False, on_coalesced=None, on_done=None,
+               start_after=None, **kwargs):
+        """작업을 등록하고 즉시 job_id를 반환합니다.
+
+        fn은 {"result_image_url": ...} 또는 {"error": ..., "status_code": ...} 형태의 dict를 반환해야 합니다.
+        fn이 코루틴 함수이면 runtime의 이벤트 루프에서, 아니면 executor 스레드에서 실행합니다.
+        dedupe_key가 같은 작업이 아직 진행 중이면 새 작업을 만들지 않고 그 작업의 job_id를 반환하므로,
+        동시에 들어온 동일 요청은 AILab 호출과 폴링을 한 번만 하고 결과(오류 포함)를 함께 받습니다.
+        report_progress=True이면 fn에 progress(**fields) 콜백을 넘겨, 진행 상황을 구독자에게 전달합니다.
+        진행 중인 작업에 합쳐져 fn이 실행되지 않으면 on_coalesced()를, 작업이 끝나면 결과 dict로 on_done(result)를 호출합니다.
+        (미리 잡아 둔 자원 반환/정산용)
+        start_after(Future)를 주면 그 Future가 끝난 뒤에야 실행을 시작합니다. (AILab 작업 슬롯을 받기 전까지
+        executor 스레드를 차지하지 않도록 - 그동안 작업은 queued 상태, progress stage는 'waiting')
+        """
+        self._purge_expired()
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        coalesced_id = None
+        with self._lock:
+            if dedupe_key is not None:
+                coalesced_id = self._inflight_keys.get(dedupe_key)
+                if coalesced_id is not None:
+                    self.coalesced += 1
+                else:
+                    self._inflight_keys[dedupe_key] = job_id
+            if coalesced_id is None:
+                self._jobs[job_id] = {
+                    'job_id': job_id,
+                    'status': JOB_QUEUED,
+                    'created_at': now,
+                    'updated_at': now,
+                    'result': None,
+                    'error': None,
+                    'status_code': None,
+                    'dedupe_key': dedupe_key,
+                    'progress': {'stage': 'waiting'} if start_after is not None and not start_after.done() else None,
+                }
+        if coalesced_id is not None:
+            if on_coalesced is not None:
+                on_coalesced()
+            return coalesced_id
+        if report_progress:
+            kwargs['progress'] = functools.partial(self.report_progress, job_id)
+        if asyncio.iscoroutinefunction(fn) and self._runtime is None:
+            raise RuntimeError("코루틴 작업을 실행하려면 TransformJobStore에 runtime이 필요합니다.")
+        start = functools.partial(self._start, job_id, fn, args, kwargs, on_done)
+        if start_after is not None:
+            start_after.add_done_callback(lambda _: start())
+        else:
+            start()
+        return job_id
+
+    def subscribe(self, job_id, loop=None):
+        """작업의 현재 상태와, 이후 이벤트를 받을 큐를 반환합니다. 작업이 없으면 None
+
+        큐에는 {"type": "status" | "progress", "job": 작업 상태 복사본} 이벤트가 들어오며,
+        다 쓴 뒤에는 unsubscribe로 해제해야 합니다.
+        loop(asyncio 이벤트 루프)를 주면 그 루프에서 await할 asyncio.Queue를 반환합니다.
+        (작업 스레드에서 call_soon_threadsafe로 넣으므로 구독자가 스레드를 차지하지 않음)
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if loop is None:
+                events = queue.SimpleQueue()
+                put = events.put
+            else:
+                events = asyncio.Queue()
+                put = functools.partial(loop.call_soon_threadsafe, events.put_nowait)
+            self._subscribers.setdefault(job_id, []).append((events, put))
+            return dict(job), events
+
+    def unsubscribe(self, job_id, events):
+        with self._lock:
+            subscribers = self._subscribers.get(job_id)
+            if not subscribers:
+                return
+            subscribers[:] = [entry for entry in subscribers if entry[0] is not events]
+            if not subscribers:
+                del self._subscribers[job_id]
+
+    def report_progress(self, job_id, **fields):
+        """진행 중인 작업의 세부 진행 상황(AILab 작업 상태 등)을 기록하고 구독자에게 전달합니다."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] in (JOB_SUCCEEDED, JOB_FAILED):
+                return
+            job['progress'] = fields
+            self._publish(job_id, 'progress', job)
+
+    def _publish(self, job_id, event_type, job):
+        # self._lock을 잡은 상태에서 호출
+        for _, put in self._subscribers.get(job_id, ()):
+            try:
+                put({'type': event_type, 'job': dict(job)})
+            except RuntimeError:
+                pass # 구독자의 이벤트 루프가 이미 닫힘 (서버 종료 중)
+
+    def create_batch(self, items):
+        """여러 작업을 묶은 배치를 등록하고 batch_id를 반환합니다.
+
+        items는 배치에 포함된 항목 dict 목록이며, 각 항목은 job_id(진행 중인 작업) 또는
+        result(캐시 등으로 이미 끝난 결과)를 가집니다.
+        """
+        batch_id = uuid.uuid4().hex
+        with self._lock:
+            self._batches[batch_id] = {
+                'batch_id': batch_id,
+                'created_at': time.time(),
+                'items': items,
+            }
+        return batch_id
+
+    def get_batch(self, batch_id):
+        """배치 항목마다 현재 작업 상태를 채운 목록을 반환합니다. 없으면 None"""
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return None
+            items = []
+            for item in batch['items']:
+                item = dict(item)
+                job = self._jobs.get(item.get('job_id'))
+                if job is not None:
+                    item['job'] = dict(job)
+                items.append(item)
+            return items
+
+    def join_in_flight(self, dedupe_key):
+        """dedupe_key가 같은 작업이 진행 중이면 그 job_id를 반환합니다. (합친 요청으로 집계, 없으면 None)
+
+        submit 전에 미리 자원(AILab 작업 슬롯 등)을 잡아야 할 때, 합쳐질 요청은 자원 없이 바로 처리하는 용도입니다.
+        """
+        with self._lock:
+            job_id = self._inflight_keys.get(dedupe_key)
+            if job_id is not None:
+                self.coalesced += 1
+            return job_id
+
+    def get(self, job_id):
+        """작업 상태의 복사본을 반환합니다. 없으면 None"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            job['updated_at'] = time.time()
+            self._publish(job_id, 'status', job)
+
+    def _start(self, job_id, fn, args, kwargs, on_done):
+        if asyncio.iscoroutinefunction(fn):
+            self._runtime.submit(self._run_async(job_id, fn, args, kwargs, on_done))
+        else:
+            self._executor.submit(self._run, job_id, fn, args, kwargs, on_done)
+
+    def _run(self, job_id, fn, args, kwargs, on_done=None):
+        self._update(job_id, status=JOB_PROCESSING)
+        try:
+            result = fn(*args, **kwargs) or {}
+        except Exception as e:
+            result = self._exception_result(job_id, e)
+        self._complete(job_id, result, on_done)
+
+    async def _run_async(self, job_id, fn, args, kwargs, on_done=None):
+        self._update(job_id, status=JOB_PROCESSING)
+        try:
+            result = await fn(*args, **kwargs) or {}
+        except Exception as e:
+            result = self._exception_result(job_id, e)
+        self._complete(job_id, result, on_done)
+
+    @staticmethod
+    def _exception_result(job_id, e):
+        import traceback
+        print(f"변환 작업 실행 중 예외 발생 (Job ID: {job_id}): {e}")
+        traceback.print_exc()
+        return {"error": f"서버 내부 오류 발생: {e}", "status_code": 500}
+
+    def _complete(self, job_id, result, on_done=None):
+        if on_done is not None:
+            # 구독자에게 결과를 알리기 전에 정산 (작업이 끝난 뒤 잔액을 조회해도 반영되어 있도록)
+            try:
+                on_done(result)
+            except Exception as e:
+                print(f"작업 완료 콜백 오류 (Job ID: {job_id}): {e}")
+        if result.get("error"):
+            self._update(job_id, status=JOB_FAILED, error=result.get("error"),
+                         status_code=result.get("status_code") or 500)
+        else:
+            self._update(job_id, status=JOB_SUCCEEDED, result=result)
+
+        with self._lock:
+            dedupe_key = self._jobs.get(job_id, {}).get('dedupe_key')
+            if dedupe_key is not None and self._inflight_keys.get(dedupe_key) == job_id:
+                del self._inflight_keys[dedupe_key]
+
+    def _purge_expired(self):
+        """TTL이 지난 완료/실패 작업을 정리합니다."""
+        cutoff = time.time() - self._ttl_seconds
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job['status'] in (JOB_SUCCEEDED, JOB_FAILED) and job['updated_at'] < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+            expired_batches = [batch_id for batch_id, batch in self._batches.items() if batch['created_at'] < cutoff]
+            for batch_id in expired_batches:
+                del self._batches[batch_id]
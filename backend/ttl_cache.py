@@ -0,0 +1,75 @@
+# backend/ttl_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """만료 시간(TTL)과 최대 항목 수(LRU 방출)를 가진 스레드 안전 메모리 캐시
+
+    - get 시 만료된 항목은 제거하고 miss로 처리합니다.
+    - 최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+    - 적중/실패/방출 횟수를 stats()로 확인할 수 있습니다.
+    """
+
+    def __init__(self, max_entries=1000, ttl_seconds=3600):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._data = OrderedDict()  # key -> (만료 시각, 값)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl_seconds=None, expires_at=None):
+        """값을 저장합니다. expires_at(epoch 초)을 주면 TTL 대신 그 시각에 만료됩니다."""
+        if expires_at is None:
+            expires_at = time.time() + (self._ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+            return default if item is None else item[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'max_entries': self._max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / total, 3) if total else None,
+            }
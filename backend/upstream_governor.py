@@ -0,0 +1,305 @@
+# backend/upstream_governor.py
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+# --- 업스트림(AILab) 호출 제한 설정 ---
+UPSTREAM_RATE_PER_SECOND = float(os.getenv('UPSTREAM_RATE_PER_SECOND', '10'))   # 초당 허용 호출 수 (토큰 충전 속도)
+UPSTREAM_BURST = int(os.getenv('UPSTREAM_BURST', '20'))                         # 한꺼번에 쓸 수 있는 최대 토큰 수
+UPSTREAM_MAX_IN_FLIGHT = int(os.getenv('UPSTREAM_MAX_IN_FLIGHT', '16'))         # 동시에 진행하는 AILab 작업 수
+UPSTREAM_MAX_QUEUED = int(os.getenv('UPSTREAM_MAX_QUEUED', '200'))              # 전체 대기열 길이
+UPSTREAM_MAX_QUEUED_PER_KEY = int(os.getenv('UPSTREAM_MAX_QUEUED_PER_KEY', '10'))  # 사용자(키)별 대기열 길이
+UPSTREAM_QUEUE_TIMEOUT = float(os.getenv('UPSTREAM_QUEUE_TIMEOUT', '120'))      # 대기열에서 기다리는 최대 시간(초)
+
+# 작업 소요 시간 추정(Retry-After 계산용) 초기값과 지수 이동 평균 가중치
+_INITIAL_TASK_SECONDS = 10.0
+_TASK_SECONDS_ALPHA = 0.2
+
+
+class GovernorBusy(Exception):
+    """대기열이 가득 차 작업을 받을 수 없을 때 발생 (retry_after: 다시 시도할 때까지 권장 대기 초)"""
+
+    def __init__(self, retry_after, message="요청이 많아 잠시 후 다시 시도해주세요."):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.message = message
+
+
+class UpstreamTicket:
+    """작업 슬롯 예약 - 차례가 되면 granted가 완료되고, 작업이 끝나면 release로 슬롯을 반환합니다.
+
+    granted.add_done_callback으로 슬롯을 받은 뒤에 작업을 시작하면 기다리는 동안 스레드를 차지하지 않습니다.
+    """
+
+    def __init__(self, governor, key, group=None):
+        self._governor = governor
+        self.key = key
+        self.granted = Future()  # 슬롯을 받으면 True, 대기 시간 초과로 취소되면 False
+        self.enqueued_at = time.monotonic()
+        self.started_at = None
+        self.ready = True     # False면 같은 묶음의 앞선 작업이 끝날 때까지 슬롯을 배정하지 않음 (reserve_group)
+        self._group = group   # 같은 묶음에서 차례를 기다리는(ready가 아닌) 티켓 deque
+        self._released = False
+
+    def wait(self, timeout=UPSTREAM_QUEUE_TIMEOUT):
+        """슬롯을 받을 때까지 기다립니다. 시간 안에 받지 못하면 대기열에서 빠지고 False"""
+        try:
+            if self.granted.result(timeout):
+                return True
+        except FutureTimeoutError: # Python 3.10에서는 내장 TimeoutError와 다른 클래스
+            pass
+        return self._governor._abandon(self)
+
+    async def wait_async(self, timeout=UPSTREAM_QUEUE_TIMEOUT):
+        """wait의 asyncio 버전 (대기 중에 이벤트 루프를 막지 않음)"""
+        try:
+            if await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(self.granted)), timeout):
+                return True
+        except asyncio.TimeoutError:
+            pass
+        return self._governor._abandon(self)
+
+    def release(self):
+        """슬롯(또는 대기열 자리)을 반환합니다. 여러 번 호출해도 한 번만 반영"""
+        self._governor._release(self)
+
+
+class UpstreamGovernor:
+    """모든 AILab 호출 앞에 두는 동시성/속도 제어기
+
+    - 토큰 버킷: 제출/폴링/결과 내려받기를 포함한 모든 HTTP 호출의 초당 횟수를 제한 (throttle)
+    - 작업 슬롯: 동시에 진행하는 AILab 작업(제출~결과) 수를 UPSTREAM_MAX_IN_FLIGHT로 제한 (reserve)
+    - 공정 대기열: 슬롯이 없으면 키(API 키/사용자/IP)별 대기열에 넣고, 슬롯이 날 때마다 키를 돌아가며 배정
+      한 사용자가 요청을 몰아 보내도 다른 사용자의 요청이 그 뒤에 밀리지 않습니다.
+    대기열(전체 또는 키별)이 가득 찼을 때만 GovernorBusy(retry_after)로 거절합니다.
+    UPSTREAM_QUEUE_TIMEOUT보다 오래 기다린 티켓은 대기열에서 빼고 granted를 False로 끝냅니다.
+    (슬롯 반환/새 예약 때 확인하므로, 슬롯을 받은 뒤에 작업을 시작하는 티켓도 시간 초과로 실패함)
+    업스트림이 429로 응답하면 penalize()로 Retry-After 동안 새 호출을 멈춥니다.
+    """
+
+    def __init__(self, rate=UPSTREAM_RATE_PER_SECOND, burst=UPSTREAM_BURST, max_in_flight=UPSTREAM_MAX_IN_FLIGHT,
+                 max_queued=UPSTREAM_MAX_QUEUED, max_queued_per_key=UPSTREAM_MAX_QUEUED_PER_KEY,
+                 queue_timeout=UPSTREAM_QUEUE_TIMEOUT):
+        self._rate = rate
+        self._burst = burst
+        self._max_in_flight = max_in_flight
+        self._max_queued = max_queued
+        self._max_queued_per_key = max_queued_per_key
+        self._queue_timeout = queue_timeout
+        self._lock = threading.Lock()
+        # 토큰 버킷 (토큰이 음수면 그만큼 앞선 호출이 예약해 둔 것)
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        # 작업 슬롯과 키별 대기열 (OrderedDict 순서 = 다음에 슬롯을 받을 키 순서)
+        self._in_flight = 0
+        self._queues = OrderedDict()  # key -> deque[UpstreamTicket]
+        self._queued = 0
+        self._parked = 0  # 대기열 중 ready가 아닌(묶음의 차례를 기다리는) 티켓 수
+        self._task_seconds = _INITIAL_TASK_SECONDS
+        # 통계
+        self.calls = 0
+        self.throttled_calls = 0
+        self.throttled_seconds = 0.0
+        self.rejected = 0
+        self.queue_timeouts = 0
+        self.upstream_429 = 0
+
+    # --- 호출 속도 (토큰 버킷) ---
+
+    def throttle(self):
+        """토큰 하나를 받을 때까지 기다립니다. (모든 동기 AILab HTTP 호출 전에 호출)"""
+        delay = self._take_token()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def throttle_async(self):
+        """throttle의 asyncio 버전"""
+        delay = self._take_token()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def penalize(self, retry_after):
+        """업스트림이 속도 제한(429)으로 응답했을 때 retry_after초 동안 새 호출을 멈춥니다."""
+        with self._lock:
+            self.upstream_429 += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            self._tokens = min(self._tokens, 0.0)
+
+    def _take_token(self):
+        """토큰을 하나 예약하고 사용 가능해질 때까지 기다릴 시간(초)을 반환합니다. (도착 순서대로 배정)"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate)
+            self._refilled_at = now
+            self._tokens -= 1
+            delay = max(0.0, -self._tokens / self._rate, self._paused_until - now)
+            self.calls += 1
+            if delay > 0:
+                self.throttled_calls += 1
+                self.throttled_seconds += delay
+            return delay
+
+    # --- 작업 슬롯 (동시 작업 수 + 공정 대기열) ---
+
+    def reserve(self, key):
+        """작업 슬롯을 예약합니다. 빈 슬롯이 있으면 바로 배정, 없으면 key 대기열에 넣은 UpstreamTicket 반환
+
+        대기열이 가득 차면 GovernorBusy를 발생시킵니다. (요청 스레드에서 호출해 바로 429로 응답)
+        """
+        return self.reserve_group(key, 1)[0]
+
+    def reserve_group(self, key, count, concurrency=None):
+        """작업 슬롯 count개를 한 번에 예약하고 UpstreamTicket 목록을 반환합니다. (모두 예약하거나 GovernorBusy)
+
+        concurrency를 주면 그 수만큼만 바로 차례를 기다리고, 나머지는 묶음의 앞선 티켓이 반환될 때마다
+        하나씩 차례에 들어갑니다. 슬롯을 받고도 묶음의 동시 실행 한도를 기다리며 놀리는 일이 없습니다.
+        """
+        group = deque() if concurrency is not None and count > concurrency else None
+        tickets = [UpstreamTicket(self, key, group) for _ in range(count)]
+        with self._lock:
+            now = time.monotonic()
+            self._expire_waiting(now)
+            active = count if group is None else concurrency
+            free = max(0, self._max_in_flight - self._in_flight - (self._queued - self._parked))
+            remaining = count - min(active, free) # 바로 배정되지 못하고 대기열에 남을 수
+            queue = self._queues.get(key)
+            queued_for_key = len(queue) if queue else 0
+            if remaining and (self._queued + remaining > self._max_queued
+                              or queued_for_key + remaining > self._max_queued_per_key):
+                self.rejected += 1
+                raise GovernorBusy(self._retry_after(queued_for_key))
+            if queue is None:
+                queue = self._queues[key] = deque()
+            for index, ticket in enumerate(tickets):
+                if index >= active:
+                    ticket.ready = False
+                    group.append(ticket)
+                    self._parked += 1
+                queue.append(ticket)
+                self._queued += 1
+            self._grant_next(now)
+        return tickets
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': self._in_flight,
+                'max_in_flight': self._max_in_flight,
+                'queued': self._queued,
+                'parked': self._parked,
+                'queued_keys': len(self._queues),
+                'rejected': self.rejected,
+                'queue_timeouts': self.queue_timeouts,
+                'calls': self.calls,
+                'throttled_calls': self.throttled_calls,
+                'throttled_seconds': round(self.throttled_seconds, 2),
+                'upstream_429': self.upstream_429,
+                'estimated_task_seconds': round(self._task_seconds, 2),
+            }
+
+    def _grant(self, ticket):
+        # self._lock을 잡은 상태에서 호출
+        self._in_flight += 1
+        ticket.started_at = time.monotonic()
+        ticket.granted.set_result(True)
+
+    def _retry_after(self, position):
+        # self._lock을 잡은 상태에서 호출: 앞선 작업들이 빠지는 데 걸릴 대략적인 시간
+        waves = (self._queued + position) / max(1, self._max_in_flight) + 1
+        return max(1, math.ceil(waves * self._task_seconds))
+
+    def _release(self, ticket):
+        with self._lock:
+            if ticket._released:
+                return
+            now = time.monotonic()
+            if ticket.started_at is None:
+                # 슬롯을 받기 전에 포기한 경우 (dedupe로 합쳐진 작업 등): 대기열에서만 제거
+                self._drop(ticket)
+            else:
+                ticket._released = True
+                elapsed = now - ticket.started_at
+                self._task_seconds += _TASK_SECONDS_ALPHA * (elapsed - self._task_seconds)
+                self._in_flight -= 1
+                self._activate_next(ticket, now)
+            self._grant_next(now)
+
+    def _abandon(self, ticket):
+        """대기 시간 초과: 그 사이 슬롯을 받았으면 True, 아니면 대기열에서 빼고 False"""
+        with self._lock:
+            if ticket.started_at is not None:
+                return True
+            if not ticket._released: # 이미 대기열에서 시간 초과로 빠졌으면 다시 세지 않음
+                self.queue_timeouts += 1
+                self._drop(ticket)
+                self._grant_next(time.monotonic())
+            return False
+
+    def _drop(self, ticket):
+        # self._lock을 잡은 상태에서 호출: 슬롯을 받지 못한 티켓을 대기열/묶음에서 빼고 granted를 False로 끝냄
+        ticket._released = True
+        queue = self._queues.get(ticket.key)
+        if queue and ticket in queue:
+            queue.remove(ticket)
+            self._queued -= 1
+            if not queue:
+                del self._queues[ticket.key]
+        if not ticket.ready:
+            ticket._group.remove(ticket)
+            self._parked -= 1
+        else:
+            self._activate_next(ticket, time.monotonic())
+        if not ticket.granted.done():
+            ticket.granted.set_result(False)
+
+    def _activate_next(self, ticket, now):
+        # self._lock을 잡은 상태에서 호출: 묶음의 다음 티켓이 차례를 기다리기 시작 (대기 시간도 이때부터)
+        if ticket._group:
+            next_ticket = ticket._group.popleft()
+            next_ticket.ready = True
+            next_ticket.enqueued_at = now
+            self._parked -= 1
+
+    def _expire_waiting(self, now):
+        # self._lock을 잡은 상태에서 호출: UPSTREAM_QUEUE_TIMEOUT보다 오래 기다린 티켓을 대기열에서 제거
+        expired = [ticket for queue in self._queues.values() for ticket in queue
+                   if ticket.ready and now - ticket.enqueued_at >= self._queue_timeout]
+        for ticket in expired:
+            self.queue_timeouts += 1
+            self._drop(ticket)
+
+    def _grant_next(self, now):
+        # self._lock을 잡은 상태에서 호출: 차례를 기다리는 티켓이 있는 맨 앞 키에 슬롯을 주고 그 키를 맨 뒤로 (라운드 로빈)
+        self._expire_waiting(now)
+        while self._in_flight < self._max_in_flight and self._queued > self._parked:
+            for key, queue in self._queues.items():
+                ticket = next((queued for queued in queue if queued.ready), None)
+                if ticket is not None:
+                    break
+            queue.remove(ticket)
+            self._queued -= 1
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            self._grant(ticket)
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_governor():
+    """모든 AILab 호출이 공유하는 UpstreamGovernor를 반환합니다."""
+    global _governor
+    if _governor is None:
+        with _governor_lock:
+            if _governor is None:
+                _governor = UpstreamGovernor()
+    return _governor
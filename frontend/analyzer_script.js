@@ -132,6 +132,7 @@ analyzeButton.addEventListener('click', async () => {
 
                     if (imageUrlFromAPI && typeof imageUrlFromAPI === 'string' && imageUrlFromAPI.startsWith('/static/')) {
                         img.src = `${window.BACKEND_BASE_URL}${imageUrlFromAPI}`;
+                        applyImageVariants(img, style.image_variants, '100px'); // .recommendation-item img 크기
                     } else {
                         console.warn(`잘못된 이미지 URL ("${imageUrlFromAPI}") 또는 URL 없음. Placeholder를 사용합니다.`);
                         img.src = placeholderFullUrl;
@@ -143,6 +144,7 @@ analyzeButton.addEventListener('click', async () => {
                         // onerror 발생 시 placeholder 절대 URL로 설정 (무한 루프 방지)
                         // 여기서 img.src는 실패한 원래 URL일 수 있으므로, placeholderFullUrl과 비교
                         if (img.src !== placeholderFullUrl) {
+                           img.removeAttribute('srcset'); // srcset이 있으면 src보다 우선하므로 제거
                            img.src = placeholderFullUrl;
                         }
                         img.style.backgroundColor='#e9ecef';
@@ -6,6 +6,17 @@
 window.BACKEND_BASE_URL = 'https://hairstyle-changer.onrender.com';
 window.FRONTEND_URL = "https://hairstyle-changer-app.onrender.com";
 
+/* ================== 반응형 카탈로그 이미지 ================== */
+// 백엔드가 준 image_variants(srcset, 백엔드 기준 경로)가 있으면 img에 srcset/sizes를 설정
+// 목록 썸네일 크기에 맞는 작은 WebP를 브라우저가 골라 받으므로 원본 전체를 내려받지 않음
+function applyImageVariants(img, variants, sizes) {
+    if (!variants || !variants.webp) return;
+    img.srcset = variants.webp.split(',')
+        .map(entry => `${window.BACKEND_BASE_URL}${entry.trim()}`)
+        .join(', ');
+    img.sizes = sizes;
+}
+
 /* ================== Intro Popup Logic ================== */
 // (참고: 이 함수들은 index.html 에만 있는 #introPopup 요소를 찾아서 동작하므로,
 //  다른 페이지에서 이 스크립트가 로드되어도 오류 없이 실행됩니다.)
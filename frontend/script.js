@@ -89,9 +89,12 @@ transformButton.addEventListener('click', async () => {
         setStatus('이미지 변환 중... 시간이 걸릴 수 있습니다.', 'processing');
 
         // 백엔드 API 호출 (fetch 사용)
+        // 로그인한 경우 토큰을 함께 보내 변환 크레딧을 차감 (서버에서 크레딧을 사용하는 경우)
+        const token = localStorage.getItem('jwtToken');
         const response = await fetch(TRANSFORM_API_URL, {
             method: 'POST',
             body: formData,
+            headers: token ? { 'Authorization': `Bearer ${token}` } : {},
         });
 
         // 응답 처리
@@ -101,16 +104,26 @@ transformButton.addEventListener('click', async () => {
             throw new Error(errorData.error || `서버 응답 오류: ${response.status}`);
         }
 
-        const data = await response.json();
+        const jobData = await response.json();
 
-        if (data.error) {
+        if (jobData.error) {
             // 백엔드에서 보낸 명시적 오류 처리
-             throw new Error(data.error);
+             throw new Error(jobData.error);
         }
 
+        // 캐시된 결과는 바로 오고, 그 외에는 작업 ID만 즉시 반환되므로 작업 상태 API를 확인하며 결과를 기다림
+        // 진행 상황은 이벤트 스트림(SSE)으로 받고, 지원하지 않는 환경에서는 상태 API를 주기적으로 확인
+        const data = jobData.result_image_url ? jobData
+            : (jobData.events_url && window.EventSource)
+                ? await streamTransformJob(jobData.events_url, jobData.status_url)
+                : await waitForTransformJob(jobData.status_url);
+
         if (data.result_image_url) {
             // 성공 시 결과 이미지 표시
-            resultImage.src = data.result_image_url;
+            // 백엔드 결과 저장소에 보관된 이미지(/results/...)는 백엔드 주소를 붙여서 사용
+            resultImage.src = data.result_image_url.startsWith('/')
+                ? `${window.BACKEND_BASE_URL}${data.result_image_url}`
+                : data.result_image_url;
             resultImage.style.display = 'block';
 
             if(resultButtonsContainer) resultButtonsContainer.style.display = 'flex';
@@ -185,13 +198,14 @@ hairStyleSelect.addEventListener('change', async function() {
 
         hairstylePreviewArea.innerHTML = `
             <div class="preview-content">
-                <img src="${imageUrl}" alt="${data.name || '헤어스타일'}" class="preview-image" onerror="this.onerror=null; this.src='${window.BACKEND_BASE_URL}/static/images/placeholder.jpg';">
+                <img src="${imageUrl}" alt="${data.name || '헤어스타일'}" class="preview-image" onerror="this.onerror=null; this.removeAttribute('srcset'); this.src='${window.BACKEND_BASE_URL}/static/images/placeholder.jpg';">
                 <div class="preview-info">
                     <h4 class="preview-name">${data.name || '이름 없음'}</h4>
                     <p class="preview-description">${data.description || '설명 없음'}</p>
                 </div>
             </div>
         `;
+        applyImageVariants(hairstylePreviewArea.querySelector('.preview-image'), data.image_variants, '100px');
         hairstylePreviewArea.style.display = 'block'; // 확실히 보이도록
 
     } catch (error) {
@@ -201,6 +215,75 @@ hairStyleSelect.addEventListener('change', async function() {
     }
 });
 
+// AILab 진행 단계별 안내 문구
+const TRANSFORM_STAGE_MESSAGES = {
+    waiting: '요청이 많아 차례를 기다리는 중...',
+    uploading: '이미지 업로드 중...',
+    submitted: '변환 요청 완료, 작업 대기 중...',
+    queued: '변환 대기 중...',
+    processing: '이미지 변환 중...',
+    storing: '변환 결과 저장 중...'
+};
+
+// 변환 작업 진행 상황 이벤트 스트림 구독 (끝나면 결과 반환)
+function streamTransformJob(eventsUrl, statusUrl) {
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(`${window.BACKEND_BASE_URL}${eventsUrl}`);
+        let finished = false;
+
+        source.addEventListener('progress', event => {
+            const progress = JSON.parse(event.data);
+            const message = TRANSFORM_STAGE_MESSAGES[progress.stage] || '이미지 변환 중...';
+            const elapsed = progress.elapsed ? ` (${Math.round(progress.elapsed)}초)` : '';
+            setStatus(`${message}${elapsed}`, 'processing');
+        });
+
+        source.addEventListener('status', event => {
+            const data = JSON.parse(event.data);
+            if (data.status === 'succeeded') {
+                finished = true;
+                source.close();
+                resolve(data);
+            } else if (data.status === 'failed') {
+                finished = true;
+                source.close();
+                reject(new Error(data.error || '변환 작업이 실패했습니다.'));
+            }
+        });
+
+        source.onerror = () => {
+            // 스트림 연결이 끊기면 기존 방식(상태 API 조회)으로 이어서 대기
+            if (finished) return;
+            finished = true;
+            source.close();
+            waitForTransformJob(statusUrl).then(resolve, reject);
+        };
+    });
+}
+
+// 변환 작업 상태 확인 (작업이 끝날 때까지 주기적으로 조회)
+async function waitForTransformJob(statusUrl) {
+    const pollInterval = 2000; // 2초 간격
+    const maxWaitMs = 3 * 60 * 1000; // 최대 3분 대기
+    const startedAt = Date.now();
+
+    while (Date.now() - startedAt < maxWaitMs) {
+        await new Promise(resolve => setTimeout(resolve, pollInterval));
+
+        const response = await fetch(`${window.BACKEND_BASE_URL}${statusUrl}`);
+        const data = await response.json().catch(() => ({ error: `HTTP 오류: ${response.status}` }));
+
+        if (!response.ok || data.error) {
+            throw new Error(data.error || `서버 응답 오류: ${response.status}`);
+        }
+        if (data.status === 'succeeded') {
+            return data;
+        }
+        // queued / processing 상태면 계속 대기
+    }
+    throw new Error('변환 결과 확인 시간이 초과되었습니다.');
+}
+
 // 상태 메시지 업데이트 함수
 function setStatus(message, type) {
     statusMessage.textContent = message;
@@ -5,6 +5,11 @@ const searchInput = document.getElementById('searchInput');
 const searchButton = document.getElementById('searchButton');
 const resultsContainer = document.getElementById('results');
 const statusMessage = document.getElementById('statusMessage');
+const suggestionList = document.getElementById('searchSuggestions');
+
+const AUTOCOMPLETE_DELAY_MS = 150; // 입력이 멈춘 뒤 자동완성을 요청할 때까지 대기 시간
+let autocompleteTimer = null;
+let autocompleteController = null;
 
 // 검색 실행 함수
 async function performSearch() {
@@ -104,10 +109,12 @@ function displayResults(results) {
         img.src = (imageUrlFromDB && imageUrlFromDB.startsWith('/static/'))
                     ? `${window.BACKEND_BASE_URL}${imageUrlFromDB}`
                     : placeholderUrl;        
+        applyImageVariants(img, style.image_variants, '150px'); // .result-item img 크기
 
         img.onerror = () => {
             // 이미지 로드 실패 시, 올바른 절대 경로의 placeholder 이미지로 설정
             console.warn(`이미지 로드 실패: ${img.src}. Placeholder 이미지로 대체합니다.`); // 실패 로그 추가
+            img.removeAttribute('srcset'); // srcset이 있으면 src보다 우선하므로 제거
             img.src = placeholderUrl; // <<< 상대 경로 대신 절대 경로 사용
             img.style.backgroundColor='#eee'; // 배경색 유지
         };
@@ -144,6 +151,40 @@ searchInput.addEventListener('keypress', function(event) {
     }
 });
 
+// 입력할 때마다 자동완성 목록 갱신 (초성 입력도 지원, 예: 'ㅍㄴㅌ' -> 포니테일)
+searchInput.addEventListener('input', function() {
+    clearTimeout(autocompleteTimer);
+    autocompleteTimer = setTimeout(updateSuggestions, AUTOCOMPLETE_DELAY_MS);
+});
+
+async function updateSuggestions() {
+    const prefix = searchInput.value.trim();
+    if (autocompleteController) {
+        autocompleteController.abort(); // 이전 요청의 늦은 응답이 목록을 덮어쓰지 않도록 취소
+    }
+    if (!prefix) {
+        suggestionList.innerHTML = '';
+        return;
+    }
+    autocompleteController = new AbortController();
+    try {
+        const response = await fetch(`${window.BACKEND_BASE_URL}/api/hairstyles/autocomplete?q=${encodeURIComponent(prefix)}&limit=8`,
+                                     { signal: autocompleteController.signal });
+        if (!response.ok) return;
+        const data = await response.json();
+        suggestionList.innerHTML = '';
+        (data.suggestions || []).forEach(name => {
+            const option = document.createElement('option');
+            option.value = name;
+            suggestionList.appendChild(option);
+        });
+    } catch (error) {
+        if (error.name !== 'AbortError') {
+            console.warn('자동완성 요청 실패:', error); // 자동완성 실패는 검색에 영향 없음
+        }
+    }
+}
+
 // 상태 메시지 업데이트 함수 (필요시 정의)
 function setStatus(message, type) {
     statusMessage.textContent = message;